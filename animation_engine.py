@@ -0,0 +1,263 @@
+"""
+Frame scheduler for the mascot animation, driven by the Tk event loop.
+
+Each frame is due at the previous frame's due time plus its duration
+(not "now + duration"), so decode/dispatch time and Tk's timer slack
+don't add up over a sequence. How late every frame actually fired is
+kept as jitter statistics. show_frame() is only called when the image
+actually changes (the talk face is re-checked every 100 ms but only set
+once); dispatched vs suppressed updates are counted. Everything runs on
+the Tk thread - there is no sleeping animation thread, and stop()
+cancels the pending timer, so a view being destroyed can't race the
+loop.
+
+Speech with a known envelope (say(), see lip_sync.py) is lip-synced:
+the talk and rest faces alternate with the envelope's mouth changes,
+each timed from when the audio started, and the talk poll isn't needed.
+
+The clock is pluggable: TkClock for the app, FakeClock to step an
+animation deterministically (e.g. in a REPL or a benchmark).
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+
+TALK_POLL = 0.1     # how often "still talking?" is checked while the talk face is shown
+MAX_LAG = 0.25      # later than this (UI was blocked) - resync instead of rushing frames
+ERROR_RETRY = 0.1   # a frame that failed to show is retried after this
+JITTER_SAMPLES = 512
+
+
+class TkClock:
+    """Monotonic time + Tk timers of a widget"""
+    def __init__(self, widget):
+        self.widget = widget
+
+    def now(self):
+        return time.monotonic()
+
+    def after(self, delay, callback):
+        return self.widget.after(max(0, int(round(delay * 1000))), callback)
+
+    def cancel(self, job):
+        self.widget.after_cancel(job)
+
+
+class FakeClock:
+    """Manually advanced clock - callbacks run in due order inside advance()"""
+    def __init__(self, start=0.0):
+        self.time = start
+        self.lag = 0.0          # added to every timer, to simulate a busy event loop
+        self._jobs = []
+        self._ids = itertools.count(1)
+        self._cancelled = set()
+
+    def now(self):
+        return self.time
+
+    def after(self, delay, callback):
+        job = next(self._ids)
+        heapq.heappush(self._jobs, (self.time + max(0.0, delay) + self.lag, job, callback))
+        return job
+
+    def cancel(self, job):
+        self._cancelled.add(job)
+
+    def advance(self, seconds):
+        end = self.time + seconds
+        while self._jobs and self._jobs[0][0] <= end:
+            due, job, callback = heapq.heappop(self._jobs)
+            if job in self._cancelled:
+                self._cancelled.discard(job)
+                continue
+            self.time = max(self.time, due)
+            callback()
+        self.time = end
+
+
+class JitterStats:
+    """How late frames were shown compared to their due time"""
+    def __init__(self, samples=JITTER_SAMPLES):
+        self._late = deque(maxlen=samples)
+        self.frames = 0
+        self.resyncs = 0
+
+    def add(self, late):
+        self.frames += 1
+        self._late.append(late)
+
+    def as_dict(self):
+        late = sorted(self._late)
+        if not late:
+            return {"frames": self.frames, "mean_late_ms": 0.0, "p95_late_ms": 0.0,
+                    "max_late_ms": 0.0, "resyncs": self.resyncs}
+        return {
+            "frames": self.frames,
+            "mean_late_ms": sum(late) / len(late) * 1000,
+            "p95_late_ms": late[min(len(late) - 1, int(len(late) * 0.95))] * 1000,
+            "max_late_ms": late[-1] * 1000,
+            "resyncs": self.resyncs,
+        }
+
+
+class AnimationEngine:
+    """
+    Plays get_animation() (an Animation with frames + is_loop) through show_frame(path).
+    on_complete() is called when a non-looping animation has finished; while
+    is_talking() is true the talk_frame is shown instead; while an envelope
+    given to say() plays, talk_frame / rest_frame follow its mouth.
+    """
+    def __init__(self, clock, get_animation, show_frame, on_complete=None, is_talking=None, talk_frame=None,
+                 rest_frame=None):
+        self.clock = clock
+        self.get_animation = get_animation
+        self.show_frame = show_frame
+        self.on_complete = on_complete
+        self.is_talking = is_talking
+        self.talk_frame = talk_frame
+        self.rest_frame = rest_frame or talk_frame
+        self.jitter = JitterStats()
+        self.shown = None           # image path currently on screen
+        self.dispatched = 0         # show_frame() calls
+        self.suppressed = 0         # updates skipped because the image was already shown
+        self.running = False
+        self.index = 0
+        self._due = None
+        self._job = None
+        self._restart = False
+        self._talking = False
+        self._speech = None         # (envelope, clock time the audio started)
+        self._new_speech = False
+        self._in_tick = False
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.index = 0
+        self._due = None
+        self._job = self.clock.after(0, self._tick)
+
+    def stop(self):
+        self.running = False
+        if self._job is not None:
+            try:
+                self.clock.cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def restart(self):
+        """Start the (new) animation from its first frame - safe to call from other threads"""
+        self._restart = True
+        self._wake()
+
+    def say(self, envelope, started):
+        """Lip-sync to audio that started playing at clock time started - safe to call from other threads"""
+        self._speech = (envelope, started)
+        self._new_speech = True
+        self._wake()
+
+    def _wake(self):
+        if self.running and not self._in_tick:
+            self.clock.after(0, self._kick)
+
+    def _kick(self):
+        if not self.running or not (self._restart or self._new_speech):
+            return
+        if self._job is not None:
+            self.clock.cancel(self._job)
+            self._job = None
+        self._due = None
+        self._tick()
+
+    def _show(self, path):
+        if path == self.shown:
+            self.suppressed += 1
+            return
+        self.show_frame(path)
+        self.shown = path
+        self.dispatched += 1
+
+    def update_counts(self):
+        return {"dispatched": self.dispatched, "suppressed": self.suppressed}
+
+    def _schedule(self, due):
+        self._due = due
+        self._job = self.clock.after(due - self.clock.now(), self._tick)
+
+    def _tick(self):
+        self._job = None
+        if not self.running:
+            return
+        self._in_tick = True
+        try:
+            self._advance()
+        except Exception as e:
+            print(f"Animation Error: {e}")
+            if self.running and self._job is None:
+                self._schedule(self.clock.now() + ERROR_RETRY)
+        finally:
+            self._in_tick = False
+
+    def _advance(self):
+        now = self.clock.now()
+        base = now
+        if self._due is not None:
+            late = now - self._due
+            self.jitter.add(late)
+            if late <= MAX_LAG:
+                base = self._due
+            else:
+                self.jitter.resyncs += 1
+
+        speech = self._speech
+        self._new_speech = False
+        if speech is not None:
+            envelope, started = speech
+            if now - started < envelope.duration:
+                self._talking = True
+                is_open, until = envelope.mouth_at(now - started)
+                self._show(self.talk_frame if is_open else self.rest_frame)
+                # Anchored to the audio, not to the previous tick
+                self._schedule(started + until)
+                return
+            if self._speech is speech:
+                self._speech = None
+
+        # Right after lip-synced speech the mixer may still report busy for a moment
+        if speech is None and self.is_talking and self.is_talking():
+            self._talking = True
+            self._show(self.talk_frame)
+            self._schedule(base + TALK_POLL)
+            return
+        if self._talking:
+            # Carry on with the next frame, timed from now
+            self._talking = False
+            base = now
+
+        if self._restart:
+            self._restart = False
+            self.index = 0
+
+        animation = self.get_animation()
+        frames = animation.frames
+        # Zero-length frames are replaced within the same tick
+        for _ in range(len(frames) + 1):
+            if self.index >= len(frames):
+                self.index = 0
+                if not animation.is_loop and self.on_complete:
+                    self.on_complete()
+                    # A state change in on_complete already starts from frame 0
+                    self._restart = False
+                    animation = self.get_animation()
+                    frames = animation.frames
+            frame = frames[self.index]
+            self.index += 1
+            if frame.duration_ms > 0:
+                break
+
+        self._show(frame.image_path)
+        self._schedule(base + frame.duration_ms / 1000.0)
@@ -1,16 +1,18 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk
+import tkinter as tk
 import threading
 import time
 import random
-import os
-import pygame
 from dataclasses import dataclass
 from typing import List
 from enum import Enum
 
 # Import the updated detector
-from presence_detector import PresenceDetector
+from presence_detector import get_detector
+from frame_store import get_frame_store, SCREEN_SIZE
+from face_compositor import FaceCanvas
+from animation_engine import AnimationEngine, TkClock
+from voice_bank import get_voice_bank
 
 # --- CONSTANTE SI STRUCTURI DE DATE ---
 SLEEP_IN_SECONDS = 60
@@ -92,135 +94,69 @@ ANIMATIONS = {
     ),
 }
 
+TALK_FRAME = "faces/talk.png"
+REST_FRAME = "faces/smile.png"   # mouth closed between syllables
+
+def preload_voice_lines():
+    """Decode every voice line into memory (and open the mixer) for the whole app"""
+    get_voice_bank().start()
+
+def preload_animation_frames(root=None):
+    """Decode every frame of ANIMATIONS (and the talking face) into the shared frame store"""
+    paths = [f.image_path for animation in ANIMATIONS.values() for f in animation.frames]
+    paths += [TALK_FRAME, REST_FRAME]
+    get_frame_store().preload(paths, root)
+
 class Character:
     def __init__(self, app_view):
         self.app = app_view
         self.current_state = State.SLEEPING
-        self.current_frame = 0
+        self.engine = None
         self.is_awake = False
         self.normal_timer = 0
         self.running = True
-        self.image_cache = {}
-        self.force_restart = False
-        
-        # --- AUDIO INIT ---
-        try:
-            pygame.mixer.init()
-            self.audio_enabled = True
-        except Exception as e:
-            print(f"Audio init failed: {e}")
-            self.audio_enabled = False
-
-        # Load voice lines paths
-        self.voice_lines = {
-            "wakeup": self._load_voice_files("voicelines/wakeup"),
-            "normal": self._load_voice_files("voicelines/normal"),
-            "chemare": self._load_voice_files("voicelines/chemare"),
-            "letsgo": self._load_voice_files("voicelines/letsgo")
-        }
-
-    def _load_voice_files(self, directory):
-        """Helper to get all .wav files from a directory."""
-        files = []
-        if os.path.exists(directory):
-            for file in os.listdir(directory):
-                if file.endswith(".wav"):
-                    files.append(os.path.join(directory, file))
-        return files
+        self.frames = get_frame_store()
+        # Decoded once at app start, plays on its own mixer channel
+        self.voice = get_voice_bank()
 
     def play_voice(self, category):
-        """Plays a random sound from the category on a separate thread to avoid UI freeze."""
-        if not self.audio_enabled:
-            return
-
-        # Definim sarcina care va rula pe thread
-        def _audio_task():
-            # Verificam in thread daca e ocupat, pentru a fi siguri
-            if pygame.mixer.music.get_busy():
-                return
-
-            if category in self.voice_lines and self.voice_lines[category]:
-                sound_file = random.choice(self.voice_lines[category])
-                try:
-                    # Load si Play sunt operatiuni I/O care pot bloca putin, de aceea sunt in thread
-                    pygame.mixer.music.load(sound_file)
-                    pygame.mixer.music.play()
-                    print(f"Playing audio (threaded): {sound_file}")
-                except Exception as e:
-                    print(f"Error playing sound: {e}")
+        """Start a random line of the category (from memory, no thread) and lip-sync to it"""
+        played = self.voice.play(category)
+        if played and played[1] and self.engine:
+            # Without an envelope the engine falls back to the talk face while the voice plays
+            self.engine.say(played[1], time.monotonic())
 
-        # Pornim thread-ul daemon (se inchide odata cu aplicatia daca e cazul)
-        threading.Thread(target=_audio_task, daemon=True).start()
-
-    def load_image(self, path):
-        if path not in self.image_cache:
-            try:
-                pil_image = Image.open(path)
-                pil_image = pil_image.resize((800, 480), Image.Resampling.LANCZOS)
-                self.image_cache[path] = ImageTk.PhotoImage(pil_image)
-            except Exception as e:
-                return None
-        return self.image_cache[path]
+    def load_face(self, path):
+        # Shared for the app lifetime - decoded at startup, not per AnimationView
+        return self.frames.face(path)
         
-    def run_animation(self):
-        """Main animation loop - Thread Safe"""
-        while self.running:
-            try:
-                # --- VERIFICARE AUDIO PENTRU "TALKING" ---
-                is_talking = False
-                # get_busy este thread-safe in general
-                if self.audio_enabled and pygame.mixer.music.get_busy():
-                    is_talking = True
-                
-                if is_talking:
-                    # Daca vorbeste, afisam "talk.png" si ignoram cadrul curent al animatiei
-                    tk_image = self.load_image("faces/talk.png")
-                    if tk_image and hasattr(self.app, 'winfo_exists') and self.app.winfo_exists():
-                         self.app.after(0, lambda img=tk_image: self._safe_gui_update(img))
-                    
-                    # Asteptam putin si verificam din nou (bucla scurta cat timp vorbeste)
-                    time.sleep(0.1)
-                    continue
+    def start_animation(self, clock):
+        """Play the current state's animation on the Tk event loop (see animation_engine.py)"""
+        self.engine = AnimationEngine(
+            clock,
+            get_animation=lambda: ANIMATIONS[self.current_state],
+            show_frame=self.show_frame,
+            on_complete=self.on_animation_complete,
+            # Daca vorbeste, afisam "talk.png" in locul cadrului curent
+            is_talking=self.is_talking,
+            talk_frame=TALK_FRAME,
+            rest_frame=REST_FRAME,
+        )
+        self.engine.start()
 
-                # --- LOGICA NORMALA DE ANIMATIE ---
-                if self.force_restart:
-                    self.force_restart = False
-                    self.current_frame = 0
-                
-                animation = ANIMATIONS[self.current_state]
-                
-                if self.current_frame >= len(animation.frames):
-                    self.current_frame = 0
-                    
-                frame = animation.frames[self.current_frame]
-                
-                tk_image = self.load_image(frame.image_path)
-                
-                if tk_image:
-                    if hasattr(self.app, 'winfo_exists') and self.app.winfo_exists():
-                        self.app.after(0, lambda img=tk_image: self._safe_gui_update(img))
-                    else:
-                        break
+    def is_talking(self):
+        return self.voice.is_speaking()
 
-                if frame.duration_ms > 0:
-                    time.sleep(frame.duration_ms / 1000.0)
-                
-                self.current_frame += 1
-                if self.current_frame >= len(animation.frames):
-                    if animation.is_loop:
-                        self.current_frame = 0
-                    else:
-                        self.on_animation_complete()
-                        
-            except Exception as e:
-                print(f"Animation Error: {e}")
-                time.sleep(0.1)
+    def show_frame(self, path):
+        face = self.load_face(path)
+        if face:
+            self._safe_gui_update(face)
 
-    def _safe_gui_update(self, img):
+    def _safe_gui_update(self, face):
         try:
-            if hasattr(self.app, 'image_label') and self.app.image_label.winfo_exists():
-                self.app.image_label.configure(image=img)
-                self.app.image_label.image = img
+            if hasattr(self.app, 'face_view') and self.app.face_canvas.winfo_exists():
+                # Only the sprites that differ from the previous frame are touched
+                self.app.face_view.show(face)
         except Exception:
             pass
 
@@ -247,8 +183,9 @@ class Character:
             self.play_voice("letsgo")
 
         self.current_state = new_state
-        self.current_frame = 0
-        self.force_restart = True
+        # Called from the behavior thread too - the engine switches on the Tk thread
+        if self.engine:
+            self.engine.restart()
         
     def behavior_loop(self):
         while self.running:
@@ -295,10 +232,17 @@ class Character:
             
     def stop(self):
         self.running = False
-        try:
-            pygame.mixer.quit()
-        except:
-            pass
+        if self.engine:
+            self.engine.stop()
+            stats = self.engine.jitter.as_dict()
+            counts = self.engine.update_counts()
+            print(f"Animation jitter: mean {stats['mean_late_ms']:.1f} ms, p95 {stats['p95_late_ms']:.1f} ms, "
+                  f"max {stats['max_late_ms']:.1f} ms over {stats['frames']} frames; "
+                  f"{counts['dispatched']} image updates, {counts['suppressed']} unchanged skipped")
+        if hasattr(self.app, 'face_view'):
+            print(f"Face layers shown/hidden: {self.app.face_view.layer_updates}")
+        # The mixer and the bank stay for the next view
+        self.voice.stop()
 
 class AnimationView(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -309,30 +253,43 @@ class AnimationView(ctk.CTkFrame):
         
         self.character = Character(self)
         
-        self.image_label = ctk.CTkLabel(self, text="", width=800, height=480)
-        self.image_label.place(x=0, y=0)
+        # The face is composed from sprites (see face_compositor.py)
+        self.face_canvas = tk.Canvas(self, width=SCREEN_SIZE[0], height=SCREEN_SIZE[1],
+                                     highlightthickness=0, bd=0)
+        self.face_canvas.place(x=0, y=0)
+        self.face_view = FaceCanvas(self.face_canvas, self.character.frames)
         
         # BINDINGS
-        self.image_label.bind("<Button-1>", self.on_image_click)
-        self.image_label.bind("<Double-Button-1>", self.on_double_click)
+        self.face_canvas.bind("<Button-1>", self.on_image_click)
+        self.face_canvas.bind("<Double-Button-1>", self.on_double_click)
         
-        self.animation_thread = threading.Thread(target=self.character.run_animation, daemon=True)
+        # Frames are scheduled on the Tk loop; only the 1 s behavior tick has its own thread
+        self.character.start_animation(TkClock(self))
         self.behavior_thread = threading.Thread(target=self.character.behavior_loop, daemon=True)
-        self.animation_thread.start()
         self.behavior_thread.start()
         
         self.controller.bind("<space>", self.on_space_key)
 
         # --- PRESENCE DETECTOR ---
-        # Create detector (uses singleton camera - won't restart camera if already running)
-        self.detector = PresenceDetector(on_detect_callback=self.thread_safe_wakeup)
-        # Start detection (this also starts camera if not already running)
-        self.detector.start()
+        # Shared detector (cascade stays loaded) - attaching starts detection,
+        # and the camera too if it isn't running yet
+        self.detector = get_detector()
+        self.detector.attach_approach(self.thread_safe_approach)
+        self.detector.attach(self.thread_safe_wakeup)
 
     def thread_safe_wakeup(self):
         if hasattr(self, 'winfo_exists') and self.winfo_exists():
             self.after(0, self.character.wake_up)
 
+    def thread_safe_approach(self):
+        if hasattr(self, 'winfo_exists') and self.winfo_exists():
+            self.after(0, self.on_approach)
+
+    def on_approach(self):
+        """Someone is walking up - get the home screen ready"""
+        if hasattr(self.controller, 'prepare_home'):
+            self.controller.prepare_home()
+
     def on_image_click(self, event):
         self.character.on_click()
     
@@ -351,9 +308,10 @@ class AnimationView(ctk.CTkFrame):
         # 1. Stop Character threads
         self.character.stop()
         
-        # 2. PAUSE detection (camera keeps running!)
+        # 2. Detach from detection (pauses it if nobody else listens, camera keeps running!)
         if hasattr(self, 'detector'):
-            self.detector.stop()  # This only stops detection, not camera
+            self.detector.detach_approach(self.thread_safe_approach)
+            self.detector.detach(self.thread_safe_wakeup)
             
         self.controller.unbind("<space>")
         print("AnimationView cleanup complete (camera still running)")
\ No newline at end of file
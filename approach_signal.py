@@ -0,0 +1,80 @@
+"""
+"Someone is walking up" signal, raised before presence is confirmed.
+
+The largest face's area ratio is sampled on every detection result.
+When it grows steadily over a short window while still under
+FACE_AREA_THRESHOLD, the visitor is most likely coming closer - the app
+gets those seconds to build the next view, decode its images and prime
+audio, so nothing is constructed when they actually tap.
+"""
+
+import time
+from collections import deque
+
+APPROACH_MIN_RATIO = 0.06       # smaller faces are too far away (and too noisy) to judge
+APPROACH_WINDOW = 1.0           # seconds of face size history looked at
+APPROACH_MIN_SAMPLES = 4        # detection results needed inside the window
+APPROACH_GROWTH = 1.3           # area must grow by this factor across the window
+APPROACH_STEADY = 0.7           # share of steps that must not shrink (box jitter allowed)
+APPROACH_JITTER = 0.9           # a step shrinking less than this still counts as steady
+APPROACH_LOST_AFTER = 2.0       # no face this long -> the approach is over, re-arm
+
+
+class ApproachDetector:
+    def __init__(self, threshold, window=APPROACH_WINDOW, growth=APPROACH_GROWTH):
+        self.threshold = threshold
+        self.window = window
+        self.growth = growth
+        self._samples = deque()
+        self.signals = 0        # approaches signalled since start-up (kept across reset())
+        self.reset()
+
+    def reset(self):
+        """Forget the current visitor (a new view attaches) - the signal counter keeps counting"""
+        self._samples.clear()
+        self._last_face = 0.0
+        self.approaching = False
+
+    def update(self, ratio, now=None):
+        """
+        Feed the largest face's area ratio (0 = no face) of one detection result.
+        Returns True only on the result where an approach is first recognised.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        if ratio <= 0:
+            if self.approaching and now - self._last_face >= APPROACH_LOST_AFTER:
+                self.approaching = False
+            self._samples.clear()
+            return False
+        self._last_face = now
+
+        if ratio < APPROACH_MIN_RATIO:
+            self._samples.clear()
+            return False
+        self._samples.append((now, ratio))
+        while now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+
+        # Already signalled for this visitor, or they're close enough for the normal trigger
+        if self.approaching or ratio >= self.threshold:
+            return False
+        if len(self._samples) < APPROACH_MIN_SAMPLES:
+            return False
+
+        first = self._samples[0][1]
+        if ratio < first * self.growth:
+            return False
+        steady = 0
+        previous = first
+        for _, value in list(self._samples)[1:]:
+            if value >= previous * APPROACH_JITTER:
+                steady += 1
+            previous = value
+        if steady < APPROACH_STEADY * (len(self._samples) - 1):
+            return False
+
+        self.approaching = True
+        self.signals += 1
+        return True
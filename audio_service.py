@@ -0,0 +1,261 @@
+"""
+The app's single owner of the pygame mixer.
+
+The mixer is opened once and stays open for the whole app. Sounds play
+on lanes - one reserved mixer channel each - instead of the one shared
+pygame.mixer.music stream:
+
+    tts     answers read out in the chat       priority 3, speech
+    voice   the mascot's voice lines           priority 2, speech
+    ui      clicks, chimes                     priority 1
+
+Rules when a lane starts: speech on a higher-priority lane stops
+(preempts) speech on lower lanes, and anything else of lower priority
+is ducked to DUCK_VOLUME until the higher lane is quiet again. Speech
+can't start while higher-priority speech plays - play() returns False.
+
+Each lane has a queue (enqueue()); a service thread starts the next
+sound when the current one ends. It doesn't poll: it sleeps until the
+earliest expected end (from Sound.get_length()) and only then asks the
+channel.
+"""
+
+import threading
+import time
+from collections import deque
+
+import pygame
+
+MIXER_FREQUENCY = 44100
+MIXER_BUFFER = 512      # frames per mixer buffer (~12 ms) - the start latency of a sound
+DUCK_VOLUME = 0.3
+END_GRACE = 0.01        # re-check this often if a channel is still busy past its expected end
+
+TTS = "tts"
+VOICE = "voice"
+UI = "ui"
+LANES = {
+    # name: (reserved channel, priority, speech)
+    TTS: (0, 3, True),
+    VOICE: (1, 2, True),
+    UI: (2, 1, False),
+}
+
+
+class _Lane:
+    def __init__(self, name, channel, priority, speech):
+        self.name = name
+        self.channel = channel
+        self.priority = priority
+        self.speech = speech
+        self.current = None     # (sound, on_end)
+        self.ends_at = None     # monotonic time the current sound should be done
+        self.remaining = None   # seconds left while paused
+        self.queue = deque()
+
+    @property
+    def active(self):
+        return self.current is not None
+
+
+class AudioService:
+    def __init__(self):
+        self.enabled = False
+        self.lanes = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self.preempted = 0
+        self.refused = 0
+
+    def start(self):
+        """Open the mixer (once) - safe to call repeatedly"""
+        with self._cond:
+            if self._running:
+                return self.enabled
+            self._running = True
+            try:
+                if not pygame.mixer.get_init():
+                    pygame.mixer.pre_init(MIXER_FREQUENCY, -16, 2, MIXER_BUFFER)
+                    pygame.mixer.init()
+                pygame.mixer.set_reserved(len(LANES))
+                self.lanes = {name: _Lane(name, pygame.mixer.Channel(channel), priority, speech)
+                              for name, (channel, priority, speech) in LANES.items()}
+                self.enabled = True
+                print("Audio service: mixer open")
+            except Exception as e:
+                print(f"Audio init failed: {e}")
+                return False
+        self._thread = threading.Thread(target=self._pump_loop, daemon=True)
+        self._thread.start()
+        return True
+
+    def shutdown(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self.enabled:
+            self.stop()
+            try:
+                pygame.mixer.quit()
+            except Exception:
+                pass
+            self.enabled = False
+
+    # --- Playback ---
+
+    def load(self, source):
+        """Decode a file (path or file object) into a Sound for play() / enqueue()"""
+        return pygame.mixer.Sound(source)
+
+    def sound_bytes(self, sound):
+        """Memory a decoded Sound holds, in the mixer's sample format"""
+        rate, size, channels = pygame.mixer.get_init()
+        return int(sound.get_length() * rate) * channels * (abs(size) // 8)
+
+    def play(self, lane, sound, on_end=None, on_start=None):
+        """
+        Play sound on the lane now, replacing what it plays and its queue.
+        on_start() is called when it starts playing, on_end(finished) when it
+        ends or is stopped (both with the service lock held - keep them short).
+        False if refused (higher-priority speech is playing) or audio is off.
+        """
+        if not self.enabled:
+            return False
+        with self._cond:
+            target = self.lanes[lane]
+            if self._blocked(target):
+                self.refused += 1
+                return False
+            self._clear(target)
+            self._start(target, sound, on_end, on_start)
+            return True
+
+    def enqueue(self, lane, sound, on_end=None, on_start=None):
+        """Play sound on the lane after what's already playing / queued there"""
+        if not self.enabled:
+            return False
+        with self._cond:
+            target = self.lanes[lane]
+            if target.active or target.queue:
+                target.queue.append((sound, on_end, on_start))
+                return True
+            if self._blocked(target):
+                self.refused += 1
+                return False
+            self._start(target, sound, on_end, on_start)
+            return True
+
+    def stop(self, lane=None):
+        """Stop a lane (or all of them) and drop its queue"""
+        if not self.enabled:
+            return
+        with self._cond:
+            for target in ([self.lanes[lane]] if lane else self.lanes.values()):
+                self._clear(target)
+            self._update_volumes()
+
+    def pause(self, lane):
+        with self._cond:
+            target = self.lanes.get(lane)
+            if target and target.active and target.remaining is None:
+                target.channel.pause()
+                target.remaining = max(0.0, target.ends_at - time.monotonic())
+                target.ends_at = None
+
+    def resume(self, lane):
+        with self._cond:
+            target = self.lanes.get(lane)
+            if target and target.active and target.remaining is not None:
+                target.channel.unpause()
+                target.ends_at = time.monotonic() + target.remaining
+                target.remaining = None
+                self._cond.notify()
+
+    def is_busy(self, lane):
+        """Something playing, paused or queued on the lane"""
+        target = self.lanes.get(lane)
+        return bool(target and (target.active or target.queue))
+
+    # --- Internals (self._cond held) ---
+
+    def _blocked(self, target):
+        return target.speech and any(
+            other.active and other.speech and other.priority > target.priority
+            for other in self.lanes.values())
+
+    def _start(self, target, sound, on_end, on_start=None):
+        for other in self.lanes.values():
+            if other.active and other.speech and target.speech and other.priority < target.priority:
+                self.preempted += 1
+                self._clear(other)
+        target.current = (sound, on_end)
+        target.remaining = None
+        target.channel.play(sound)
+        target.ends_at = time.monotonic() + sound.get_length()
+        self._update_volumes()
+        self._cond.notify()
+        if on_start:
+            try:
+                on_start()
+            except Exception as e:
+                print(f"Audio callback error: {e}")
+
+    def _clear(self, target):
+        target.queue.clear()
+        if target.current is not None:
+            target.channel.stop()
+            self._finish(target, False)
+
+    def _finish(self, target, finished):
+        _, on_end = target.current
+        target.current = None
+        target.ends_at = None
+        target.remaining = None
+        if on_end:
+            try:
+                on_end(finished)
+            except Exception as e:
+                print(f"Audio callback error: {e}")
+
+    def _update_volumes(self):
+        for target in self.lanes.values():
+            louder = any(other.active and other.priority > target.priority for other in self.lanes.values())
+            target.channel.set_volume(DUCK_VOLUME if louder else 1.0)
+
+    def _pump_loop(self):
+        with self._cond:
+            while self._running:
+                now = time.monotonic()
+                ends = [t.ends_at for t in self.lanes.values() if t.ends_at is not None]
+                if not ends:
+                    self._cond.wait()
+                    continue
+                due = min(ends)
+                if due > now:
+                    self._cond.wait(due - now)
+                    continue
+                for target in self.lanes.values():
+                    if target.ends_at is None or target.ends_at > now:
+                        continue
+                    if target.channel.get_busy():
+                        # Mixer is a buffer behind the estimate
+                        target.ends_at = now + END_GRACE
+                        continue
+                    self._finish(target, True)
+                    if target.queue:
+                        self._start(target, *target.queue.popleft())
+                self._update_volumes()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_audio_service():
+    """The shared audio service, created on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = AudioService()
+    return _service
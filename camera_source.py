@@ -0,0 +1,258 @@
+"""
+Camera sources for the presence detector.
+
+CameraSource is what PresenceDetector talks to: a running flag, the
+preview/detection sizes and a FrameRing of grayscale detection frames.
+CameraSingleton (presence_detector.py) fills it from Picamera2;
+ReplaySource plays recorded frames instead, so the whole detection
+stack can run and be profiled on a normal Linux box.
+
+Select the replay source with environment variables:
+    CAMERA_REPLAY=path/to/frames       image dir, .npy stack, dataset dir or video
+    CAMERA_REPLAY_SPEED=realtime|max   (default realtime)
+    CAMERA_REPLAY_FPS=30                (default: the dataset's own rate, else 30)
+    CAMERA_REPLAY_LOOP=1
+"""
+
+import json
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from camera_watchdog import FrameTelemetry
+from frame_ring import FrameRing, RING_SIZE
+
+FRAME_WAIT_TIMEOUT = 0.5   # seconds without a new frame before re-checking state
+REPLAY_FPS = 30.0
+DETECT_SIZE = (320, 240)
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".pgm", ".bmp")
+
+
+class CameraSource:
+    """Common part of every camera source - frame ring access and overlay hook"""
+    def __init__(self):
+        self.running = False
+        self.w0 = self.h0 = 0
+        self.w1 = self.h1 = 0
+        self.overlay_callback = None
+        self.frame_ring = None
+        self._shm = None
+        self.telemetry = FrameTelemetry()
+
+    def start(self):
+        raise NotImplementedError
+
+    def shutdown(self):
+        raise NotImplementedError
+
+    @property
+    def recovering(self):
+        """True while a watchdog is trying to bring a failed camera back"""
+        return False
+
+    def _publish(self, grey, timestamp, sensor_time=None, record=True):
+        """Write one detection frame into the ring and record it in the telemetry (unless record=False)"""
+        if not self.frame_ring.write(grey, timestamp):
+            return False
+        if record:
+            self.telemetry.record(timestamp, sensor_time)
+        return True
+
+    def get_stats(self):
+        """Frame rate / interval / stall counters of this source"""
+        return self.telemetry.as_dict()
+
+    def _ensure_ring(self):
+        # Grayscale buffers are allocated once here and refilled in place
+        if self.frame_ring is None or self.frame_ring.shape != (self.h1, self.w1):
+            self._release_shared_frames()
+            self.frame_ring = FrameRing((self.h1, self.w1), RING_SIZE)
+
+    def enable_shared_frames(self):
+        """
+        Move the frame ring into shared memory so a detector process can read
+        frames in place. Returns the shared memory name (camera must be started).
+        """
+        if self._shm is None:
+            shape = (self.h1, self.w1)
+            self._shm = shared_memory.SharedMemory(create=True, size=RING_SIZE * self.h1 * self.w1)
+            # Readers still holding frames of the old ring keep it alive until they release
+            self.frame_ring = FrameRing(shape, RING_SIZE, buffer=self._shm.buf)
+            print(f"Frame ring moved to shared memory: {self._shm.name}")
+        return self._shm.name
+
+    def _release_shared_frames(self):
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        self.frame_ring = None
+        try:
+            shm.unlink()
+            shm.close()
+        except (BufferError, FileNotFoundError):
+            # Views of the buffer may still exist - the OS frees it once they are gone
+            pass
+
+    def borrow_frame(self, after_sequence=0, timeout=FRAME_WAIT_TIMEOUT):
+        """
+        Wait for a lores frame newer than after_sequence and borrow it.
+        Returns a FrameRef (call release() when done) or None.
+        """
+        if not self.running or self.frame_ring is None:
+            # No camera (stopped or being recovered) - don't let readers spin
+            time.sleep(timeout)
+            return None
+        return self.frame_ring.borrow(after_sequence, timeout)
+
+    def get_detection_frame(self):
+        """Latest grayscale frame for face detection (poll mode) -> borrowed FrameRef"""
+        if not self.running or self.frame_ring is None:
+            return None
+        return self.frame_ring.borrow_latest()
+
+    def set_overlay_callback(self, callback):
+        """Set the drawing callback"""
+        self.overlay_callback = callback
+
+    def clear_overlay_callback(self):
+        """Remove drawing callback"""
+        self.overlay_callback = None
+
+
+def _to_grey(image, size=DETECT_SIZE):
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if (image.shape[1], image.shape[0]) != size:
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    return np.ascontiguousarray(image)
+
+
+def load_frames(path, size=DETECT_SIZE):
+    """Every frame of a recording as grayscale arrays of the detection size"""
+    if os.path.isdir(path):
+        stack = os.path.join(path, "frames.npy")
+        if os.path.exists(stack):
+            return [_to_grey(f, size) for f in np.load(stack)]
+        names = sorted(n for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTENSIONS))
+        return [_to_grey(cv2.imread(os.path.join(path, n), cv2.IMREAD_GRAYSCALE), size) for n in names]
+    if path.endswith(".npy"):
+        return [_to_grey(f, size) for f in np.load(path)]
+
+    frames = []
+    cap = cv2.VideoCapture(path)
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(_to_grey(frame, size))
+    cap.release()
+    return frames
+
+
+def recorded_fps(path):
+    """Frame rate stored with a frame_recorder dataset (annotations.json), None if unknown"""
+    meta = os.path.join(path, "annotations.json")
+    if not os.path.isfile(meta):
+        return None
+    try:
+        with open(meta, "r", encoding="utf-8") as f:
+            return float(json.load(f)["fps"])
+    except (ValueError, KeyError, OSError):
+        return None
+
+
+class ReplaySource(CameraSource):
+    """
+    Plays recorded frames into the frame ring like the real camera would.
+    realtime: one frame every 1/fps seconds, late readers lose frames.
+    max: next frame as soon as the previous one was picked up, nothing is dropped.
+    """
+    def __init__(self, frames, fps=None, speed="realtime", loop=False):
+        super().__init__()
+        if isinstance(frames, str):
+            fps = fps or recorded_fps(frames)
+            frames = load_frames(frames)
+        self.frames = frames
+        self.fps = fps or REPLAY_FPS
+        self.speed = speed
+        self.loop = loop
+        self.position = 0
+        # monotonic publish time of every frame - benchmarks measure latency against it
+        self.published_at = [None] * len(self.frames)
+        self.finished = threading.Event()
+        self._thread = None
+        if self.frames:
+            self.h1, self.w1 = self.frames[0].shape[:2]
+            # No preview window - report the same preview size as the real camera
+            self.w0, self.h0 = self.w1 * 2, self.h1 * 2
+
+    def start(self):
+        if self.running:
+            return True
+        if not self.frames:
+            print("Replay source has no frames")
+            return False
+        self._ensure_ring()
+        self.running = True
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._playback_loop, daemon=True)
+        self._thread.start()
+        print(f"Replay started: {len(self.frames)} frames, {self.speed} @ {self.fps:.0f} fps")
+        return True
+
+    def _playback_loop(self):
+        period = 1.0 / self.fps
+        next_time = time.monotonic()
+        while self.running:
+            if self.position >= len(self.frames):
+                if not self.loop:
+                    break
+                self.position = 0
+
+            if self.speed == "max":
+                # Lock-step with the reader so every frame gets processed
+                while self.running and not self.frame_ring.wait_taken(FRAME_WAIT_TIMEOUT):
+                    pass
+            else:
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_time += period
+
+            if not self.running:
+                break
+            now = time.monotonic()
+            if self._publish(self.frames[self.position], now) and self.published_at[self.position] is None:
+                self.published_at[self.position] = now
+            self.position += 1
+
+        if self.speed == "max" and self.running:
+            self.frame_ring.wait_taken(FRAME_WAIT_TIMEOUT)
+        self.finished.set()
+
+    def shutdown(self):
+        if not self.running:
+            return
+        self.running = False
+        if self.frame_ring is not None:
+            self.frame_ring.clear()
+        self._release_shared_frames()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+
+def replay_from_env():
+    """ReplaySource configured from CAMERA_REPLAY*, or None when not set"""
+    path = os.getenv("CAMERA_REPLAY")
+    if not path:
+        return None
+    return ReplaySource(
+        path,
+        fps=float(os.getenv("CAMERA_REPLAY_FPS", 0)) or None,
+        speed=os.getenv("CAMERA_REPLAY_SPEED", "realtime"),
+        loop=os.getenv("CAMERA_REPLAY_LOOP", "1") == "1",
+    )
@@ -0,0 +1,185 @@
+"""
+Camera health: frame-interval telemetry and a stall watchdog.
+
+Every frame a camera source delivers is recorded in its FrameTelemetry
+(interval since the previous frame, and capture latency when the sensor
+timestamp is known). CameraWatchdog checks that telemetry a few times a
+second; when a running camera has produced nothing for STALL_TIMEOUT,
+or the camera couldn't be opened at all (e.g. "Device or resource busy"
+while another process still holds it), it re-acquires the camera with
+exponential backoff - the app keeps running and detection simply
+resumes when frames come back.
+"""
+
+import threading
+import time
+
+STALL_TIMEOUT = 2.0         # seconds without a frame that count as a stall
+WATCHDOG_INTERVAL = 0.5     # how often the watchdog looks
+RETRY_BACKOFF = (1.0, 30.0) # first and maximum delay between re-acquire attempts
+TELEMETRY_WINDOW = 5.0      # seconds per frame-rate report window
+
+
+class FrameTelemetry:
+    """Inter-frame interval / capture latency of one camera source"""
+    def __init__(self, window=TELEMETRY_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.last_frame = None      # monotonic time of the newest frame
+        self.fps = 0.0
+        self.interval_ms = 0.0      # mean interval in the last window
+        self.max_interval_ms = 0.0  # worst interval in the last window
+        self.latency_ms = 0.0       # mean sensor -> publish latency in the last window
+        self.stalls = 0
+        self.stall_time = 0.0       # seconds spent stalled in total
+        self.last_stall = None
+        self.recoveries = 0
+        self.failed_starts = 0
+        self._reset_window(time.monotonic())
+
+    def _reset_window(self, now):
+        self._window_start = now
+        self._window_frames = 0
+        self._intervals = 0
+        self._interval_total = 0.0
+        self._interval_max = 0.0
+        self._latency_total = 0.0
+        self._latency_frames = 0
+
+    def record(self, now, sensor_time=None):
+        """One published frame (camera thread); sensor_time in time.monotonic() seconds if known"""
+        with self._lock:
+            if self.last_frame is not None:
+                interval = now - self.last_frame
+                self._intervals += 1
+                self._interval_total += interval
+                self._interval_max = max(self._interval_max, interval)
+            if sensor_time is not None:
+                self._latency_total += now - sensor_time
+                self._latency_frames += 1
+            self.last_frame = now
+            self.frames += 1
+            self._window_frames += 1
+
+            elapsed = now - self._window_start
+            if elapsed >= self.window:
+                self.fps = self._window_frames / elapsed
+                self.interval_ms = self._interval_total / max(1, self._intervals) * 1000
+                self.max_interval_ms = self._interval_max * 1000
+                self.latency_ms = (self._latency_total / self._latency_frames * 1000
+                                   if self._latency_frames else 0.0)
+                self._reset_window(now)
+
+    def frame_age(self, now=None):
+        """Seconds since the last frame (None before the first one)"""
+        if self.last_frame is None:
+            return None
+        return (now or time.monotonic()) - self.last_frame
+
+    def as_dict(self, stall_timeout=STALL_TIMEOUT):
+        """Counters for get_stats() - while no frame came for stall_timeout, 0 fps and the current gap"""
+        with self._lock:
+            fps, interval_ms, max_interval_ms = self.fps, self.interval_ms, self.max_interval_ms
+            age = self.frame_age()
+            if age is not None and age >= stall_timeout:
+                # The window only closes on a frame - don't report the last healthy rate
+                fps = 0.0
+                interval_ms = age * 1000
+                max_interval_ms = max(max_interval_ms, interval_ms)
+            return {
+                "camera_fps": fps,
+                "frame_interval_ms": interval_ms,
+                "max_frame_interval_ms": max_interval_ms,
+                "capture_latency_ms": self.latency_ms,
+                "camera_frames": self.frames,
+                "stalls": self.stalls,
+                "stall_time_s": self.stall_time,
+                "recoveries": self.recoveries,
+                "failed_starts": self.failed_starts,
+            }
+
+
+class CameraWatchdog:
+    """
+    Keeps a camera source alive. The camera provides:
+      telemetry             FrameTelemetry it records every delivered frame in
+                            (whether or not detection consumes it)
+      running               True while frames are expected
+      _reacquire()          close and reopen the device, True on success
+    """
+    def __init__(self, camera, stall_timeout=STALL_TIMEOUT, interval=WATCHDOG_INTERVAL):
+        self.camera = camera
+        self.stall_timeout = stall_timeout
+        self.interval = interval
+        self.running = False
+        self._thread = None
+        self._stop = threading.Event()
+        self._stalled_since = None
+        self._running_since = None
+        self._next_attempt = 0.0
+        self._backoff = RETRY_BACKOFF[0]
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        self._stop.set()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def _watch_loop(self):
+        telemetry = self.camera.telemetry
+        while not self._stop.wait(self.interval):
+            now = time.monotonic()
+            if self.camera.running:
+                if self._running_since is None:
+                    self._running_since = now
+                age = telemetry.frame_age(now)
+                if age is None:
+                    # Started but no frame yet
+                    age = now - self._running_since
+                if age < self.stall_timeout:
+                    if self._stalled_since is not None:
+                        self._end_stall(now)
+                    continue
+                if self._stalled_since is None:
+                    # Frames stopped (or never came) - counted once per stall
+                    self._stalled_since = now - age
+                    telemetry.stalls += 1
+                    telemetry.last_stall = now
+                    self._next_attempt = now
+                    print(f"Camera stalled: no frame for {age:.1f} s")
+            else:
+                self._running_since = None
+                if self._stalled_since is None:
+                    # Start failed - keep trying to acquire the device
+                    self._stalled_since = now
+                    self._next_attempt = now + self._backoff
+
+            if now >= self._next_attempt:
+                self._try_reacquire(now)
+
+    def _try_reacquire(self, now):
+        print(f"Camera watchdog: re-acquiring camera (backoff {self._backoff:.1f} s)")
+        if self.camera._reacquire():
+            # Success is confirmed by the next frame (_end_stall)
+            self._next_attempt = now + self.stall_timeout + self._backoff
+        else:
+            self.camera.telemetry.failed_starts += 1
+            self._next_attempt = now + self._backoff
+        self._backoff = min(self._backoff * 2, RETRY_BACKOFF[1])
+
+    def _end_stall(self, now):
+        telemetry = self.camera.telemetry
+        telemetry.stall_time += now - self._stalled_since
+        telemetry.recoveries += 1
+        print(f"Camera recovered after {now - self._stalled_since:.1f} s")
+        self._stalled_since = None
+        self._backoff = RETRY_BACKOFF[0]
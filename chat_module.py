@@ -55,6 +55,13 @@ TRANSLATIONS = {
     }
 }
 
+# Texte fixe care se citesc cu voce - sintetizate in avans in cache-ul TTS (tts_cache.py)
+SPOKEN_KEYS = ('welcome',)
+
+def spoken_phrases():
+    """(lang, text) of every fixed string the chat reads out"""
+    return [(lang, texts[key]) for lang, texts in TRANSLATIONS.items() for key in SPOKEN_KEYS]
+
 THEMES = {
     1: { "name": "Standard", "bg": "#0f172a", "header": "#1e293b", "chat_bg": "#0f172a", "input_bg": "#334155", "user_bubble": "#3b82f6", "ai_bubble": "#1e293b", "accent": "#60a5fa", "btn_hover": "#2563eb", "font": "Roboto Medium", "avatar": "AI" },
     2: { "name": "Profesor", "bg": "#022c22", "header": "#064e3b", "chat_bg": "#022c22", "input_bg": "#065f46", "user_bubble": "#10b981", "ai_bubble": "#064e3b", "accent": "#34d399", "btn_hover": "#059669", "font": "Times New Roman", "avatar": "P" },
@@ -222,6 +229,7 @@ class ChatView(ctk.CTkFrame):
         self.keyboard_visible = False
         self.is_thinking = False
         self.pending_bubble = None
+        self.ai_request = 0  # answers of an older request are dropped
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
@@ -282,6 +290,8 @@ class ChatView(ctk.CTkFrame):
         welcome = TRANSLATIONS['ro']['welcome']
         self.add_message(welcome, "AI")
         self.after(800, lambda: self.tts.speak(welcome) if self.voice_enabled else None)
+        # Restul frazelor fixe (celelalte limbi) - doar ce lipseste din cache
+        self.after(3000, lambda: self.tts.warm_up(spoken_phrases()))
 
     def mk_btn(self, txt, code):
         b = ctk.CTkButton(self.controls, text=txt, width=40, height=30, corner_radius=15, fg_color="transparent", border_width=1, border_color="#475569", font=("Arial",11,"bold"), command=lambda: self.change_language(code))
@@ -438,11 +448,13 @@ class ChatView(ctk.CTkFrame):
         thk = "⏳ " + TRANSLATIONS[self.current_lang].get('thinking', '...')
         self.pending_bubble = self.add_message(thk, "AI")
         
-        threading.Thread(target=self.proc_ai, args=(txt,), daemon=True).start()
+        self.ai_request += 1
+        threading.Thread(target=self.proc_ai, args=(txt, self.ai_request), daemon=True).start()
 
-    def proc_ai(self, txt):
+    def proc_ai(self, txt, request_id):
         resp_data = self.ai.ask_gemini(txt) if self.ai else {"msg": "Error AI", "ref_ids": []}
-        if not self.winfo_exists(): return
+        # Cancelled (view left) while Gemini was answering
+        if request_id != self.ai_request or not self.winfo_exists(): return
         self.after(0, lambda: self.fin_ai(resp_data))
 
     def fin_ai(self, resp_data):
@@ -468,6 +480,13 @@ class ChatView(ctk.CTkFrame):
         if self.voice_enabled: self.tts.speak(text_resp)
         self.after(100, self.refresh_suggestions)
 
+    def cleanup(self):
+        """Called when switching away: silence TTS and drop any pending AI answer"""
+        self.ai_request += 1
+        self.tts.stop()
+        self.pending_bubble = None
+        print(f"TTS cache: {self.tts.cache.stats()}")
+
     def add_message(self, txt, snd):
         if not self.winfo_exists(): return None
         # AICI SE FACE LEGATURA CU FUNCTIA DE RAPORTARE
@@ -0,0 +1,181 @@
+"""
+Face detection in a separate process.
+
+The camera's frame ring lives in shared memory (CameraSource.enable_shared_frames),
+so the worker reads frames in place. The UI process only sends the ring
+index of a borrowed frame and gets back the compact face boxes, keeping
+detectMultiScale off the interpreter (and GIL) that runs Tk, the mascot
+animation and TTS. One frame is in flight at a time - while the worker is
+busy the camera keeps overwriting the latest frame, so nothing queues up.
+"""
+
+import atexit
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+
+import numpy as np
+
+WORKER_START_TIMEOUT = 10.0   # spawning + loading the backend
+WORKER_REPLY_TIMEOUT = 2.0    # one frame should never take this long
+
+
+def _attach_shared_memory(name):
+    """Open the camera's ring without letting this process' resource tracker unlink it on exit"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always tracks - undo it by hand
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _worker_main(conn, shm_name, shape, ring_size, backend_name, min_face_size, motion_gate, tracking):
+    """Runs in the child process - only imports what detection needs (no Tk, no picamera2, no pygame)"""
+    from face_backends import create_backend
+    from face_pipeline import FacePipeline
+
+    shm = _attach_shared_memory(shm_name)
+    frames = np.ndarray((ring_size,) + tuple(shape), np.uint8, buffer=shm.buf)
+    backend = create_backend(backend_name)
+    pipeline = None
+    if backend is not None:
+        pipeline = FacePipeline(backend, (shape[1], shape[0]), min_face_size, motion_gate, tracking)
+    conn.send(("ready", pipeline is not None))
+
+    try:
+        while True:
+            msg = conn.recv()
+            if msg[0] == "frame":
+                _, index, sequence = msg
+                started = time.perf_counter()
+                faces = pipeline.process(frames[index]) if pipeline else None
+                conn.send(("faces", sequence, faces, time.perf_counter() - started))
+            elif msg[0] == "reset":
+                if pipeline:
+                    pipeline.reset()
+            elif msg[0] == "stop":
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del frames
+        shm.close()
+        conn.close()
+
+
+class DetectorProcess:
+    """UI-side handle of the worker process"""
+    def __init__(self, backend_name, min_face_size, motion_gate=True, tracking=True):
+        self.backend_name = backend_name
+        self.min_face_size = min_face_size
+        self.motion_gate = motion_gate
+        self.tracking = tracking
+        self.process = None
+        self.conn = None
+        self.shm_name = None
+        self.last_process_time = 0.0
+        self.starts = 0
+
+    def ensure_started(self, shm_name, shape, ring_size):
+        """(Re)start the worker if it isn't running on this shared ring"""
+        if self.process and self.process.poll() is None and self.shm_name == shm_name:
+            return True
+        self.close()
+
+        # A fresh interpreter running this file - not fork (Tk, camera and audio threads
+        # are running here) and not multiprocessing spawn (it would re-import main.py)
+        parent_sock, child_sock = socket.socketpair()
+        config = {
+            "shm_name": shm_name, "shape": list(shape), "ring_size": ring_size,
+            "backend": self.backend_name, "min_face_size": list(self.min_face_size),
+            "motion_gate": self.motion_gate, "tracking": self.tracking,
+        }
+        here = os.path.dirname(os.path.abspath(__file__))
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(here, "detector_worker.py"), str(child_sock.fileno()), json.dumps(config)],
+            pass_fds=(child_sock.fileno(),),
+            cwd=here,
+        )
+        child_sock.close()
+        self.conn = Connection(parent_sock.detach())
+        self.shm_name = shm_name
+
+        if not self.conn.poll(WORKER_START_TIMEOUT):
+            print("Detector worker did not start")
+            self.close()
+            return False
+        _, ok = self.conn.recv()
+        if not ok:
+            print("Detector worker could not load a face backend")
+            self.close()
+            return False
+        self.starts += 1
+        print(f"Detector worker started (pid {self.process.pid})")
+        return True
+
+    def detect(self, frame):
+        """
+        Run the pipeline on a borrowed FrameRef - it must stay borrowed until this returns.
+        Returns the face boxes, None if the motion gate skipped the frame, or raises on worker failure.
+        """
+        self.conn.send(("frame", frame.index, frame.sequence))
+        deadline = time.monotonic() + WORKER_REPLY_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.conn.poll(remaining):
+                self.close()
+                raise RuntimeError("detector worker timed out")
+            kind, sequence, faces, process_time = self.conn.recv()
+            # Ignore a late answer for an earlier frame
+            if kind == "faces" and sequence == frame.sequence:
+                self.last_process_time = process_time
+                return faces
+
+    def reset(self):
+        if self.conn:
+            try:
+                self.conn.send(("reset",))
+            except (OSError, ValueError):
+                pass
+
+    def close(self):
+        if self.conn:
+            try:
+                self.conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+            self.conn.close()
+            self.conn = None
+        if self.process:
+            try:
+                self.process.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                self.process.terminate()
+            self.process = None
+        self.shm_name = None
+
+
+# Shared worker - one per app, reused by every PresenceDetector
+_worker = None
+
+def get_detector_process(backend_name, min_face_size, motion_gate=True, tracking=True):
+    global _worker
+    if _worker is None:
+        _worker = DetectorProcess(backend_name, min_face_size, motion_gate, tracking)
+        atexit.register(_worker.close)
+    return _worker
+
+
+if __name__ == "__main__":
+    # Started by DetectorProcess: detector_worker.py <socket fd> <config json>
+    cfg = json.loads(sys.argv[2])
+    _worker_main(Connection(int(sys.argv[1])), cfg["shm_name"], tuple(cfg["shape"]), cfg["ring_size"],
+                 cfg["backend"], tuple(cfg["min_face_size"]), cfg["motion_gate"], cfg["tracking"])
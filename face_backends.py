@@ -0,0 +1,219 @@
+"""
+Face detector backends.
+
+Every backend takes a grayscale image and returns (x, y, w, h) boxes,
+so PresenceDetector and FaceTracker don't care which one is running.
+Pick one with FACE_BACKEND in presence_detector.py (or the FACE_BACKEND
+environment variable):
+
+  haar  - haarcascade_frontalface_default.xml (ships with the repo)
+  lbp   - lbpcascade_frontalface_improved.xml (faster, slightly less robust)
+  yunet - OpenCV FaceDetectorYN, needs models/face_detection_yunet_2023mar.onnx
+  ssd   - ResNet-10 SSD, needs models/deploy.prototxt and
+          models/res10_300x300_ssd_iter_140000.caffemodel
+
+DNN backends run on the CPU only. If a backend can't load its files,
+create_backend() falls back to Haar.
+"""
+
+import os
+import threading
+
+import cv2
+
+# Relative to the repo, not the working directory - tools/ run from anywhere
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, "models")
+
+HAAR_PATHS = [
+    "/usr/share/opencv4/haarcascades/haarcascade_frontalface_default.xml",
+    "/usr/share/opencv/haarcascades/haarcascade_frontalface_default.xml",
+    os.path.join(BASE_DIR, "haarcascade_frontalface_default.xml"),
+]
+
+LBP_PATHS = [
+    "/usr/share/opencv4/lbpcascades/lbpcascade_frontalface_improved.xml",
+    "/usr/share/opencv/lbpcascades/lbpcascade_frontalface_improved.xml",
+    os.path.join(MODEL_DIR, "lbpcascade_frontalface_improved.xml"),
+    "/usr/share/opencv4/lbpcascades/lbpcascade_frontalface.xml",
+    "/usr/share/opencv/lbpcascades/lbpcascade_frontalface.xml",
+]
+
+YUNET_MODEL = os.path.join(MODEL_DIR, "face_detection_yunet_2023mar.onnx")
+SSD_CONFIG = os.path.join(MODEL_DIR, "deploy.prototxt")
+SSD_MODEL = os.path.join(MODEL_DIR, "res10_300x300_ssd_iter_140000.caffemodel")
+
+DNN_SCORE_THRESHOLD = 0.6
+
+
+def _size_filter(boxes, min_size, max_size):
+    """DNN detectors search every scale anyway - apply min/max size afterwards ((0, 0) = no limit)"""
+    out = []
+    for (x, y, w, h) in boxes:
+        if w < min_size[0] or h < min_size[1]:
+            continue
+        if max_size[0] and (w > max_size[0] or h > max_size[1]):
+            continue
+        out.append((x, y, w, h))
+    return out
+
+
+class FaceBackend:
+    """Base class - load() once, then detect() per frame"""
+    name = "base"
+
+    def load(self):
+        raise NotImplementedError
+
+    def detect(self, image, min_size=(0, 0), max_size=(0, 0)):
+        raise NotImplementedError
+
+
+class CascadeBackend(FaceBackend):
+    paths = []
+    scale_factor = 1.1
+    min_neighbors = 5
+
+    def __init__(self):
+        self.classifier = None
+        self.path = None
+
+    def load(self):
+        for path in self.paths:
+            if os.path.exists(path):
+                classifier = cv2.CascadeClassifier(path)
+                if not classifier.empty():
+                    self.classifier = classifier
+                    self.path = path
+                    print(f"Loaded cascade: {path}")
+                    return True
+        return False
+
+    def detect(self, image, min_size=(0, 0), max_size=(0, 0)):
+        return self.classifier.detectMultiScale(image, self.scale_factor, self.min_neighbors,
+                                                minSize=min_size, maxSize=max_size)
+
+
+class HaarBackend(CascadeBackend):
+    name = "haar"
+    paths = HAAR_PATHS
+
+
+class LbpBackend(CascadeBackend):
+    name = "lbp"
+    paths = LBP_PATHS
+    min_neighbors = 4
+
+
+class YuNetBackend(FaceBackend):
+    name = "yunet"
+
+    def __init__(self, model_path=YUNET_MODEL):
+        self.model_path = model_path
+        self.net = None
+        self._input_size = None
+        self._bgr = None
+
+    def load(self):
+        if not os.path.exists(self.model_path) or not hasattr(cv2, "FaceDetectorYN"):
+            return False
+        self.net = cv2.FaceDetectorYN.create(self.model_path, "", (320, 240), DNN_SCORE_THRESHOLD)
+        print(f"Loaded YuNet: {self.model_path}")
+        return True
+
+    def detect(self, image, min_size=(0, 0), max_size=(0, 0)):
+        h, w = image.shape[:2]
+        if self._input_size != (w, h):
+            self.net.setInputSize((w, h))
+            self._input_size = (w, h)
+        # YuNet wants 3 channels - reuse the conversion buffer between frames
+        self._bgr = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR, dst=self._bgr)
+        _, faces = self.net.detect(self._bgr)
+        if faces is None:
+            return []
+        boxes = [(int(f[0]), int(f[1]), int(f[2]), int(f[3])) for f in faces]
+        return _size_filter(boxes, min_size, max_size)
+
+
+class SsdBackend(FaceBackend):
+    name = "ssd"
+    input_size = (300, 300)
+
+    def __init__(self, config_path=SSD_CONFIG, model_path=SSD_MODEL):
+        self.config_path = config_path
+        self.model_path = model_path
+        self.net = None
+        self._bgr = None
+
+    def load(self):
+        if not (os.path.exists(self.config_path) and os.path.exists(self.model_path)):
+            return False
+        self.net = cv2.dnn.readNetFromCaffe(self.config_path, self.model_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        print(f"Loaded SSD: {self.model_path}")
+        return True
+
+    def detect(self, image, min_size=(0, 0), max_size=(0, 0)):
+        h, w = image.shape[:2]
+        self._bgr = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR, dst=self._bgr)
+        blob = cv2.dnn.blobFromImage(self._bgr, 1.0, self.input_size, (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        detections = self.net.forward()
+        boxes = []
+        for i in range(detections.shape[2]):
+            if detections[0, 0, i, 2] < DNN_SCORE_THRESHOLD:
+                continue
+            x0, y0, x1, y1 = detections[0, 0, i, 3:7]
+            x0, y0 = max(0, int(x0 * w)), max(0, int(y0 * h))
+            x1, y1 = min(w, int(x1 * w)), min(h, int(y1 * h))
+            if x1 > x0 and y1 > y0:
+                boxes.append((x0, y0, x1 - x0, y1 - y0))
+        return _size_filter(boxes, min_size, max_size)
+
+
+BACKENDS = {
+    "haar": HaarBackend,
+    "lbp": LbpBackend,
+    "yunet": YuNetBackend,
+    "ssd": SsdBackend,
+}
+
+
+def load_backend(name):
+    """Create and load one backend by name, or None if its files are missing"""
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        print(f"Unknown face backend: {name}")
+        return None
+    backend = backend_class()
+    if not backend.load():
+        print(f"Face backend '{name}' could not be loaded")
+        return None
+    return backend
+
+
+def create_backend(name="haar"):
+    """Backend from configuration, falling back to Haar if it can't be loaded"""
+    backend = load_backend(name)
+    if backend is None and name != "haar":
+        print("Falling back to Haar cascade")
+        backend = load_backend("haar")
+    if backend is None:
+        print("ERROR: Could not load face cascade!")
+    return backend
+
+
+# Loaded backends live for the whole process - the Haar XML alone is ~1 MB to parse
+_backend_cache = {}
+_backend_lock = threading.Lock()
+
+def get_backend(name="haar"):
+    """Shared, lazily loaded backend (create_backend result cached per name)"""
+    with _backend_lock:
+        if name not in _backend_cache:
+            backend = create_backend(name)
+            if backend is None:
+                return None
+            _backend_cache[name] = backend
+        return _backend_cache[name]
@@ -0,0 +1,157 @@
+"""
+The mascot face as sprites on a Tk canvas instead of full-screen images.
+
+Every face in faces/ is a flat background with a few features on it
+(eyes, brows/lids, mouth, z's...). split_face() cuts a frame into the
+bounding boxes of those features; FaceSprites keeps each distinct crop
+once - the smile's mouth, the brows, an eye that only moved a few pixels
+and differs in anti-aliasing only - so a frame becomes a short list of
+(sprite, x, y) placements. Adding a new expression PNG only costs the
+sprites nothing else already has.
+
+FaceCanvas shows a frame by hiding the placements of the previous frame
+that aren't in the new one and showing the new ones; layers that stay
+(the eyes while only the mouth talks) are not touched.
+"""
+
+import hashlib
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+SPRITE_MATCH = 16       # crops whose pixels differ by at most this (anti-aliasing) are stored once
+
+
+def split_face(pixels):
+    """
+    (background RGB, [(x, y, crop)]) of an RGB frame - one crop per feature,
+    features whose boxes overlap are merged so crops never cover each other
+    """
+    background = pixels[0, 0]
+    mask = np.any(pixels != background, axis=2).astype(np.uint8)
+    n, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    boxes = [[x, y, x + w, y + h] for x, y, w, h, _ in stats[1:n]]
+
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                a, b = boxes[i], boxes[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    boxes[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del boxes[j]
+                    merged = True
+                    break
+            if merged:
+                break
+
+    crops = [(x0, y0, pixels[y0:y1, x0:x1]) for x0, y0, x1, y1 in sorted(boxes, key=lambda b: (b[1], b[0]))]
+    return tuple(int(c) for c in background), crops
+
+
+class FaceSprites:
+    """Distinct sprite crops of all faces added so far, and each face's placements"""
+    def __init__(self, match=SPRITE_MATCH):
+        self.match = match
+        self._crops = []        # sprite id -> RGB array (see release_pixels)
+        self._photos = {}       # sprite id -> PhotoImage
+        self._sizes = []        # sprite id -> (w, h)
+        self._exact = {}        # content hash -> sprite id
+        self._by_shape = {}     # crop shape -> [sprite id]
+        self.faces = {}         # name -> Face
+        self.frame_size = None
+
+    def _sprite(self, crop):
+        digest = hashlib.blake2b(crop.tobytes(), digest_size=16).digest() + bytes(str(crop.shape), "ascii")
+        sprite = self._exact.get(digest)
+        if sprite is not None:
+            return sprite
+        for sprite in self._by_shape.get(crop.shape, ()):
+            other = self._crops[sprite]
+            if other is not None and np.abs(other.astype(np.int16) - crop).max() <= self.match:
+                self._exact[digest] = sprite
+                return sprite
+        sprite = len(self._sizes)
+        self._crops.append(np.ascontiguousarray(crop))
+        self._sizes.append((crop.shape[1], crop.shape[0]))
+        self._exact[digest] = sprite
+        self._by_shape.setdefault(crop.shape, []).append(sprite)
+        return sprite
+
+    def add(self, name, image):
+        """Split a PIL image into sprites; returns its Face"""
+        pixels = np.asarray(image.convert("RGB"))
+        background, crops = split_face(pixels)
+        placements = tuple((self._sprite(crop), x, y) for x, y, crop in crops)
+        self.frame_size = (pixels.shape[1], pixels.shape[0])
+        face = Face(background, placements)
+        self.faces[name] = face
+        return face
+
+    def photo(self, sprite):
+        """PhotoImage of a sprite (Tk thread)"""
+        photo = self._photos.get(sprite)
+        if photo is None:
+            photo = ImageTk.PhotoImage(Image.fromarray(self._crops[sprite]))
+            self._photos[sprite] = photo
+        return photo
+
+    def release_pixels(self):
+        """Drop the arrays of sprites Tk already holds - faces added later won't match them any more"""
+        for sprite in self._photos:
+            self._crops[sprite] = None
+
+    def memory(self):
+        """Sprite pixels held vs what the same faces cost as full frames (Tk keeps 4 bytes a pixel)"""
+        sprite_bytes = sum(w * h for w, h in self._sizes) * 4
+        frame_bytes = 0
+        if self.frame_size:
+            frame_bytes = len(self.faces) * self.frame_size[0] * self.frame_size[1] * 4
+        return {"faces": len(self.faces), "sprites": len(self._sizes),
+                "sprite_bytes": sprite_bytes, "frame_bytes": frame_bytes}
+
+
+class Face:
+    """Background colour + (sprite id, x, y) placements of one frame"""
+    __slots__ = ("background", "placements")
+
+    def __init__(self, background, placements):
+        self.background = background
+        self.placements = placements
+
+
+class FaceCanvas:
+    """
+    Shows Faces on a tk.Canvas, touching only the sprites that differ from
+    the current frame. photos.photo(sprite id) provides the PhotoImages
+    (a FaceSprites, or the FrameStore holding one).
+    """
+    def __init__(self, canvas, photos):
+        self.canvas = canvas
+        self.photos = photos
+        self._items = {}        # placement -> canvas item
+        self._shown = set()
+        self._background = None
+        self.layer_updates = 0  # canvas items shown or hidden
+
+    def show(self, face):
+        if face.background != self._background:
+            self._background = face.background
+            self.canvas.configure(bg="#%02x%02x%02x" % face.background)
+
+        wanted = set(face.placements)
+        for placement in self._shown - wanted:
+            self.canvas.itemconfigure(self._items[placement], state="hidden")
+            self.layer_updates += 1
+        for placement in wanted - self._shown:
+            item = self._items.get(placement)
+            if item is None:
+                sprite, x, y = placement
+                item = self.canvas.create_image(x, y, anchor="nw", image=self.photos.photo(sprite))
+                self._items[placement] = item
+            else:
+                self.canvas.itemconfigure(item, state="normal")
+            self.layer_updates += 1
+        self._shown = wanted
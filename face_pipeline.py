@@ -0,0 +1,47 @@
+"""
+Per-frame face search: motion gate -> ROI tracker -> detector backend.
+
+Kept free of camera and UI code so the same pipeline runs inside
+PresenceDetector's thread or in the detector worker process.
+"""
+
+from motion_gate import MotionGate
+from face_tracker import FaceTracker
+
+
+class FacePipeline:
+    def __init__(self, backend, frame_size, min_face_size, motion_gate=True, tracking=True):
+        self.backend = backend
+        self.min_face_size = min_face_size
+        self.motion_gate = MotionGate() if motion_gate else None
+        self.tracker = FaceTracker(self._detect, frame_size, min_face_size) if tracking else None
+
+    def _detect(self, image, min_size, max_size):
+        return self.backend.detect(image, min_size, max_size)
+
+    def reset(self):
+        if self.motion_gate:
+            self.motion_gate.reset()
+        if self.tracker:
+            self.tracker.reset()
+
+    def process(self, grey_frame):
+        """Face boxes for this frame, or None if the motion gate skipped it"""
+        # Static scene and nobody in view - keep the last result, skip the cascade
+        if self.motion_gate and not self.motion_gate.should_detect(grey_frame):
+            return None
+
+        if self.tracker:
+            faces = self.tracker.detect(grey_frame)
+        else:
+            h, w = grey_frame.shape[:2]
+            faces = [tuple(int(v) for v in b) for b in self._detect(grey_frame, self.min_face_size, (w, h))]
+
+        if self.motion_gate:
+            self.motion_gate.report_faces(len(faces) > 0)
+        return faces
+
+    def counters(self):
+        if not self.tracker:
+            return {}
+        return {"full_scans": self.tracker.full_scans, "roi_scans": self.tracker.roi_scans}
@@ -0,0 +1,87 @@
+"""
+ROI-restricted face re-detection.
+
+Once faces are known, the next frames are only searched in a window
+around each previous box and only at scales close to the previous size.
+A full-frame scan still runs every TRACK_RESCAN_FRAMES frames (and as
+soon as every tracked face is lost) so new faces are picked up.
+"""
+
+TRACK_MARGIN = 0.5          # window grows by this fraction of the box on each side
+TRACK_SCALE_RANGE = (0.7, 1.4)  # min/max size relative to the previous box
+TRACK_RESCAN_FRAMES = 15    # full-frame scan at least this often while tracking
+
+
+def _overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    return inter > 0.3 * min(aw * ah, bw * bh)
+
+
+class FaceTracker:
+    """
+    detect_fn(image, min_size, max_size) -> iterable of (x, y, w, h)
+    is whatever backend actually runs the detector.
+    """
+    def __init__(self, detect_fn, frame_size, min_face_size=(0, 0),
+                 margin=TRACK_MARGIN, rescan_frames=TRACK_RESCAN_FRAMES):
+        self.detect_fn = detect_fn
+        self.frame_w, self.frame_h = frame_size
+        self.min_face_size = min_face_size
+        self.margin = margin
+        self.rescan_frames = rescan_frames
+        self.full_scans = 0
+        self.roi_scans = 0
+        self.reset()
+
+    def reset(self):
+        self.boxes = []
+        self._since_full = 0
+
+    def detect(self, grey_frame):
+        """Returns the face boxes for this frame, in full-frame coordinates"""
+        self.frame_h, self.frame_w = grey_frame.shape[:2]
+
+        if not self.boxes or self._since_full >= self.rescan_frames:
+            return self._full_scan(grey_frame)
+
+        found = []
+        for box in self.boxes:
+            for hit in self._roi_scan(grey_frame, box):
+                if not any(_overlaps(hit, other) for other in found):
+                    found.append(hit)
+
+        if not found:
+            # Everybody lost - look everywhere right away instead of waiting for the rescan
+            return self._full_scan(grey_frame)
+
+        self._since_full += 1
+        self.boxes = found
+        return found
+
+    def _full_scan(self, grey_frame):
+        self.full_scans += 1
+        self._since_full = 0
+        max_size = (self.frame_w, self.frame_h)
+        self.boxes = [tuple(int(v) for v in b) for b in self.detect_fn(grey_frame, self.min_face_size, max_size)]
+        return self.boxes
+
+    def _roi_scan(self, grey_frame, box):
+        self.roi_scans += 1
+        x, y, w, h = box
+        mx, my = int(w * self.margin), int(h * self.margin)
+        x0, y0 = max(0, x - mx), max(0, y - my)
+        x1, y1 = min(self.frame_w, x + w + mx), min(self.frame_h, y + h + my)
+
+        lo, hi = TRACK_SCALE_RANGE
+        min_size = (max(self.min_face_size[0], int(w * lo)), max(self.min_face_size[1], int(h * lo)))
+        max_size = (min(x1 - x0, int(w * hi)), min(y1 - y0, int(h * hi)))
+        if min_size[0] > max_size[0] or min_size[1] > max_size[1]:
+            return []
+
+        roi = grey_frame[y0:y1, x0:x1]
+        return [(int(fx) + x0, int(fy) + y0, int(fw), int(fh))
+                for (fx, fy, fw, fh) in self.detect_fn(roi, min_size, max_size)]
@@ -0,0 +1,185 @@
+"""
+Rolling capture of detection frames for building benchmark clips.
+
+FrameRecorder borrows lores frames from the running camera source - the
+same CameraSource the PresenceDetector reads, so it never opens the
+camera itself - and copies them into a bounded ring allocated once
+(RECORD_SECONDS at RECORD_FPS). Nothing touches the SD card until a
+dump: when presence is confirmed (a few seconds later, so the clip shows
+what happened after the trigger) or on demand. A dump is a dataset
+directory that camera_source.load_frames / ReplaySource and
+tools/bench_presence.py read directly:
+
+    recordings/<time>_<reason>/frames.npy        (N, h, w) uint8
+    recordings/<time>_<reason>/annotations.json  per-frame faces + presence state
+
+Enable inside the app with PRESENCE_RECORDER=1 (PRESENCE_RECORDER_DIR,
+PRESENCE_RECORDER_SECONDS), or run tools/video_recorder.py standalone.
+Note: frames the recorder borrows no longer count as dropped in the
+detector's frame statistics.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from presence_filter import ENTER
+
+RECORD_SECONDS = 20.0       # how much history is kept in memory
+RECORD_FPS = 15.0           # camera frames are subsampled to this rate
+RECORD_POST_TRIGGER = 3.0   # keep recording this long after a trigger before dumping
+RECORD_DIR = "recordings"
+
+
+class FrameRecorder:
+    def __init__(self, camera, detector=None, seconds=RECORD_SECONDS, fps=RECORD_FPS,
+                 out_dir=RECORD_DIR, dump_on_trigger=True):
+        self.camera = camera
+        self.detector = detector
+        self.seconds = seconds
+        self.fps = fps
+        self.out_dir = out_dir
+        self.dump_on_trigger = dump_on_trigger
+        self.capacity = max(1, int(seconds * fps))
+        self.running = False
+        self.dumps = 0
+        self._frames = None          # (capacity, h, w), allocated on the first frame
+        self._meta = [None] * self.capacity
+        self._count = 0              # frames written so far (ring position = count % capacity)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pending_dump = None    # (reason, due time)
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        if self.detector and self.dump_on_trigger:
+            self.detector.attach_events(self._on_presence_event)
+        self._thread = threading.Thread(target=self._record_loop, daemon=True)
+        self._thread.start()
+        print(f"Frame recorder started ({self.seconds:.0f} s @ {self.fps:.0f} fps in memory)")
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        if self.detector and self.dump_on_trigger:
+            self.detector.detach_events(self._on_presence_event)
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def request_dump(self, reason="manual", delay=0.0):
+        """Ask the record thread to dump (after delay seconds) - safe from any thread or signal handler"""
+        self._pending_dump = (reason, time.monotonic() + delay)
+
+    def _on_presence_event(self, event):
+        # Detection thread - only schedule, the record loop does the dump
+        if event.kind == ENTER and self._pending_dump is None:
+            self.request_dump("trigger", RECORD_POST_TRIGGER)
+
+    def _annotation(self, timestamp):
+        """What the detector knew when this frame was copied (its latest result)"""
+        meta = {"t": timestamp}
+        detector = self.detector
+        if detector is None:
+            return meta
+        meta["faces"] = [[int(v) for v in f] for f in detector.faces]
+        meta["ratio"] = round(detector.presence.ratio, 4)
+        meta["looking"] = detector.presence.look_start is not None
+        meta["present"] = detector.presence.present
+        return meta
+
+    def _record_loop(self):
+        period = 1.0 / self.fps
+        last_sequence = 0
+        last_kept = 0.0
+        ring = None
+        while self.running:
+            pending = self._pending_dump
+            if pending and time.monotonic() >= pending[1]:
+                self._pending_dump = None
+                self.dump(pending[0])
+
+            if self.camera.frame_ring is not ring:
+                # Ring replaced (e.g. moved to shared memory) - sequences restart
+                ring = self.camera.frame_ring
+                last_sequence = 0
+            frame = self.camera.borrow_frame(last_sequence)
+            if frame is None:
+                continue
+            with frame:
+                last_sequence = frame.sequence
+                if frame.timestamp - last_kept < period * 0.9:
+                    continue
+                last_kept = frame.timestamp
+                with self._lock:
+                    if self._frames is None or self._frames.shape[1:] != frame.array.shape:
+                        self._frames = np.zeros((self.capacity,) + frame.array.shape, np.uint8)
+                        self._count = 0
+                    slot = self._count % self.capacity
+                    np.copyto(self._frames[slot], frame.array)
+                    self._meta[slot] = self._annotation(frame.timestamp)
+                    self._count += 1
+
+    def snapshot(self):
+        """Buffered frames (oldest first) and their annotations - copies, safe to keep"""
+        with self._lock:
+            if self._frames is None or self._count == 0:
+                return None, []
+            n = min(self._count, self.capacity)
+            start = self._count % self.capacity if self._count > self.capacity else 0
+            order = [(start + i) % self.capacity for i in range(n)]
+            frames = self._frames[order]
+            meta = [self._meta[i] for i in order]
+        return frames, meta
+
+    def dump(self, reason="manual"):
+        """Write the buffered history as a replayable dataset; returns its directory (or None)"""
+        frames, meta = self.snapshot()
+        if frames is None:
+            print("Frame recorder: nothing to dump yet")
+            return None
+
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{reason}"
+        path = os.path.join(self.out_dir, name)
+        tmp = path + ".partial"
+        os.makedirs(tmp, exist_ok=True)
+
+        t0 = meta[0]["t"]
+        threshold = self.detector.presence.enter_ratio if self.detector else None
+        close_from = None
+        if threshold is not None:
+            close_from = next((i for i, m in enumerate(meta) if m.get("ratio", 0) >= threshold), None)
+        annotations = {
+            "reason": reason,
+            "fps": self.fps,
+            "size": [int(frames.shape[2]), int(frames.shape[1])],
+            "frames": len(meta),
+            # Same meaning as in tools/presence_scenarios.json
+            "close_from": close_from,
+            "expect_trigger": any(m.get("present") for m in meta),
+            "annotations": [dict(m, t=round(m["t"] - t0, 3)) for m in meta],
+        }
+        np.save(os.path.join(tmp, "frames.npy"), frames)
+        with open(os.path.join(tmp, "annotations.json"), "w", encoding="utf-8") as f:
+            json.dump(annotations, f)
+        os.replace(tmp, path)
+        self.dumps += 1
+        print(f"Frame recorder: {len(meta)} frames saved to {path} ({reason})")
+        return path
+
+
+def recorder_from_env(camera, detector=None):
+    """FrameRecorder configured from PRESENCE_RECORDER*, or None when not enabled"""
+    if os.getenv("PRESENCE_RECORDER", "0") != "1":
+        return None
+    return FrameRecorder(
+        camera, detector,
+        seconds=float(os.getenv("PRESENCE_RECORDER_SECONDS", RECORD_SECONDS)),
+        out_dir=os.getenv("PRESENCE_RECORDER_DIR", RECORD_DIR),
+    )
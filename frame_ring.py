@@ -0,0 +1,159 @@
+"""
+Preallocated grayscale frame ring shared by the camera and its readers.
+
+The camera thread copies each lores Y plane into one of a few buffers
+allocated once at startup, so no new arrays are created per frame.
+Readers (detector, overlay, recorder) borrow the latest frame, read it
+in place and release it - a borrowed buffer is never overwritten.
+Only the newest frame is handed out: frames nobody borrowed before the
+next one arrived are counted as dropped, never queued.
+"""
+
+import threading
+
+import numpy as np
+
+RING_SIZE = 4
+
+
+class FrameRef:
+    """A borrowed, read-only frame. Call release() (or use `with`) when done."""
+    __slots__ = ("array", "timestamp", "sequence", "_ring", "_index", "_released")
+
+    def __init__(self, ring, index, array, timestamp, sequence):
+        self._ring = ring
+        self._index = index
+        self.array = array
+        self.timestamp = timestamp
+        self.sequence = sequence
+        self._released = False
+
+    @property
+    def index(self):
+        """Buffer slot in the ring (position in a shared-memory backed ring)"""
+        return self._index
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._ring._release(self._index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class FrameRing:
+    """
+    Fixed pool of grayscale buffers with borrow/release semantics.
+    write() is called by the single producer (camera thread),
+    borrow()/borrow_latest() by any number of readers.
+    With `buffer` (e.g. SharedMemory.buf) the slots are laid out back to back
+    in it, so another process can map the same frames.
+    """
+    def __init__(self, shape, size=RING_SIZE, dtype=np.uint8, buffer=None):
+        self.shape = tuple(shape)
+        self.size = size
+        if buffer is None:
+            self._buffers = [np.zeros(self.shape, dtype) for _ in range(size)]
+        else:
+            slots = np.ndarray((size,) + self.shape, dtype, buffer=buffer)
+            self._buffers = [slots[i] for i in range(size)]
+        # Readers only ever see read-only views of the buffers
+        self._views = []
+        for buf in self._buffers:
+            view = buf.view()
+            view.flags.writeable = False
+            self._views.append(view)
+
+        self._refs = [0] * size
+        self._timestamps = [0.0] * size
+        self._sequences = [0] * size
+        self._taken = [False] * size
+        self._latest = -1
+        self._next = 0
+        self._sequence = 0
+        self._cond = threading.Condition()
+
+        self.published = 0
+        self.dropped = 0     # frames replaced before anybody borrowed them
+        self.overruns = 0    # frames lost because every buffer was borrowed
+
+    def write(self, source, timestamp):
+        """Copy source into a free buffer and publish it as the latest frame"""
+        size = len(self._buffers)
+        with self._cond:
+            index = -1
+            for i in range(size):
+                candidate = (self._next + i) % size
+                if self._refs[candidate] == 0 and candidate != self._latest:
+                    index = candidate
+                    break
+            if index < 0:
+                self.overruns += 1
+                return False
+            self._next = (index + 1) % size
+            self._refs[index] = 1  # writer holds it while filling
+
+        np.copyto(self._buffers[index], source)
+
+        with self._cond:
+            self._refs[index] = 0
+            if self._latest >= 0 and not self._taken[self._latest]:
+                self.dropped += 1
+            self._sequence += 1
+            self._sequences[index] = self._sequence
+            self._timestamps[index] = timestamp
+            self._taken[index] = False
+            self._latest = index
+            self.published += 1
+            self._cond.notify_all()
+        return True
+
+    def borrow(self, after_sequence=0, timeout=None):
+        """Block until a frame newer than after_sequence exists, then borrow it (or None on timeout)"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._sequence > after_sequence and self._latest >= 0, timeout):
+                return None
+            return self._borrow_locked(self._latest)
+
+    def borrow_latest(self):
+        """Borrow the newest frame without waiting (None if nothing published yet)"""
+        with self._cond:
+            if self._latest < 0:
+                return None
+            return self._borrow_locked(self._latest)
+
+    def wait_taken(self, timeout=None):
+        """Block until the latest frame has been borrowed at least once (lock-step producers)"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._latest < 0 or self._taken[self._latest], timeout)
+
+    def _borrow_locked(self, index):
+        self._refs[index] += 1
+        if not self._taken[index]:
+            self._taken[index] = True
+            self._cond.notify_all()
+        return FrameRef(self, index, self._views[index],
+                        self._timestamps[index], self._sequences[index])
+
+    def _release(self, index):
+        with self._cond:
+            self._refs[index] -= 1
+
+    @property
+    def sequence(self):
+        return self._sequence
+
+    def borrowed(self):
+        """Number of buffers currently held by readers"""
+        with self._cond:
+            return sum(1 for r in self._refs if r > 0)
+
+    def clear(self):
+        """Forget the latest frame (buffers stay allocated)"""
+        with self._cond:
+            self._latest = -1
+            self._cond.notify_all()
@@ -0,0 +1,159 @@
+"""
+App-lifetime store of the mascot's animation frames.
+
+Frames are decoded (and scaled to the screen) once, in a background
+thread at startup, and split into face sprites (face_compositor.py) -
+the full frames are dropped right away, only the distinct eye / mouth /
+lid crops stay. Their PhotoImages are created on the Tk thread a few at
+a time. Views come and go, the store stays: returning to the animation
+never decodes anything again, and the first pass through a sequence
+finds every frame ready.
+
+Frames that need resampling are also cached on disk as raw pixels
+(CACHE_DIR), keyed by source path, mtime, size and target size, so the
+LANCZOS pass only ever runs once per image version. Frames already at
+screen size are not cached - reading the raw pixels back from the SD
+card would be slower than decoding the small PNG.
+"""
+
+import os
+import threading
+
+import numpy as np
+from PIL import Image
+
+from face_compositor import FaceSprites
+
+SCREEN_SIZE = (800, 480)
+CACHE_DIR = os.path.join(".cache", "frames")
+FACES_PER_TICK = 2      # faces whose sprite PhotoImages are created per Tk idle slot while warming up
+
+
+class FrameStore:
+    def __init__(self, size=SCREEN_SIZE, cache_dir=CACHE_DIR):
+        self.size = size
+        self.cache_dir = cache_dir
+        self.sprites = FaceSprites()
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._root = None
+        self.decoded = 0
+        self.cache_hits = 0
+
+    def _cache_path(self, path):
+        st = os.stat(path)
+        name = os.path.basename(path).replace(".", "_")
+        return os.path.join(self.cache_dir, f"{name}_{int(st.st_mtime)}_{st.st_size}_{self.size[0]}x{self.size[1]}.npy")
+
+    def _decode(self, path):
+        """Scaled PIL image for path, from the disk cache when possible"""
+        cached = None
+        try:
+            cached = self._cache_path(path)
+            if os.path.exists(cached):
+                pixels = np.load(cached)
+                self.cache_hits += 1
+                return Image.fromarray(pixels)
+        except (OSError, ValueError):
+            pass
+
+        image = Image.open(path)
+        image.load()
+        self.decoded += 1
+        if image.size == self.size:
+            return image
+
+        image = image.resize(self.size, Image.Resampling.LANCZOS)
+        if cached:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp = cached + ".tmp"
+                with open(tmp, "wb") as f:
+                    np.save(f, np.asarray(image))
+                os.replace(tmp, cached)
+            except OSError as e:
+                print(f"Frame cache write failed: {e}")
+        return image
+
+    def _load(self, path):
+        with self._lock:
+            if path in self.sprites.faces or path in self._failed:
+                return
+        try:
+            image = self._decode(path)
+        except Exception as e:
+            print(f"Frame load failed {path}: {e}")
+            with self._lock:
+                self._failed.add(path)
+            return
+        with self._lock:
+            if path not in self.sprites.faces:
+                self.sprites.add(path, image)
+
+    def preload(self, paths, root=None):
+        """Decode paths in the background; with a Tk root, also create their PhotoImages on its thread"""
+        paths = list(dict.fromkeys(paths))
+        self._root = root
+
+        def _run():
+            for path in paths:
+                self._load(path)
+            mem = self.sprites.memory()
+            print(f"Face sprites: {mem['faces']} frames -> {mem['sprites']} sprites, "
+                  f"{mem['sprite_bytes'] / 1e6:.1f} MB instead of {mem['frame_bytes'] / 1e6:.1f} MB")
+            self._schedule_warm(paths, 0)
+
+        self._thread = threading.Thread(target=_run, daemon=True)
+        self._thread.start()
+
+    def _schedule_warm(self, paths, delay_ms):
+        if self._root is None:
+            return
+        try:
+            if paths:
+                self._root.after(delay_ms, self._warm_photos, paths)
+            else:
+                self._root.after(delay_ms, self._release_pixels)
+        except Exception:
+            pass  # window already closed
+
+    def _warm_photos(self, paths):
+        # Tk thread - a couple per tick so the animation keeps running while warming up
+        for path in paths[:FACES_PER_TICK]:
+            face = self.face(path)
+            if face is not None:
+                for sprite, _, _ in face.placements:
+                    self.photo(sprite)
+        self._schedule_warm(paths[FACES_PER_TICK:], 10)
+
+    def _release_pixels(self):
+        # Every preloaded sprite is in Tk now
+        with self._lock:
+            self.sprites.release_pixels()
+
+    def face(self, path):
+        """Sprite layout of a frame (decoded now if the background preload hasn't got to it yet)"""
+        face = self.sprites.faces.get(path)
+        if face is None:
+            self._load(path)
+            face = self.sprites.faces.get(path)
+        return face
+
+    def photo(self, sprite):
+        """PhotoImage of one sprite (Tk thread)"""
+        with self._lock:
+            return self.sprites.photo(sprite)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_frame_store():
+    """The shared frame store, created on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = FrameStore()
+    return _store
@@ -31,11 +31,17 @@ def create_dummy_images_if_missing():
 
 create_dummy_images_if_missing()
 
+# Decoded + rounded card images, shared by every HomeView instance
+_card_images = {}
+
+def clear_image_cache():
+    _card_images.clear()
+
 class HomeView(ctk.CTkFrame):
-    def __init__(self, parent, controller):
+    def __init__(self, parent, controller, activate=True):
         super().__init__(parent)
         self.controller = controller
-        self.pack(fill="both", expand=True)
+        self.active = False
 
         self.last_interaction = time.time()
         self.inactivity_limit = 20  # Seconds
@@ -48,6 +54,18 @@ class HomeView(ctk.CTkFrame):
         # NEW: Setup the settings button
         self.setup_settings_button()
 
+        # Pre-built views (controller.prepare_view) stay hidden until shown
+        if activate:
+            self.activate()
+
+    def activate(self):
+        """Show the view and start its timers / bindings"""
+        if self.active:
+            return
+        self.active = True
+        self.pack(fill="both", expand=True)
+
+        self.last_interaction = time.time()
         self.check_inactivity()
         
         self.controller.bind_all("<Motion>", self.reset_timer)
@@ -94,8 +112,10 @@ class HomeView(ctk.CTkFrame):
         canvas.grid(row=0, column=col, padx=15)
 
         try:
-            pil_img = Image.open(img_path)
-            pil_img = self.round_corners(pil_img, radius=30)
+            pil_img = _card_images.get(img_path)
+            if pil_img is None:
+                pil_img = self.round_corners(Image.open(img_path), radius=30)
+                _card_images[img_path] = pil_img
             tk_img = ImageTk.PhotoImage(pil_img)
             canvas.image = tk_img 
             canvas.create_image(BTN_WIDTH//2, BTN_HEIGHT//2, image=tk_img)
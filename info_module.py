@@ -239,4 +239,4 @@ class InfoView(ctk.CTkFrame):
         self.update_content()
 
     def cleanup(self):
-        pass
\ No newline at end of file
+        self.tk_images.clear()
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Mouth movement for the mascot's speech, from precomputed audio envelopes.
+
+Each clip is analysed once: the RMS level of every ENVELOPE_HOP of audio,
+relative to the clip's loudest hop, stored as uint8 next to the audio
+(<clip>.env.npz, rebuilt when the clip is newer). From the levels the
+envelope derives when the mouth opens and closes (with hysteresis and a
+minimum hold so it doesn't flutter), and the animation engine just sets
+a timer for the next change - nothing listens to the audio while it
+plays.
+"""
+
+import bisect
+import os
+import threading
+import wave
+
+import numpy as np
+
+ENVELOPE_HOP = 0.04     # seconds of audio per envelope level (25 per second)
+MOUTH_OPEN = 0.30       # level (of the clip's peak) that opens the mouth
+MOUTH_CLOSE = 0.15      # ... and below which it closes again
+MOUTH_HOLD = 0.08       # shortest time the mouth stays open or closed
+CACHE_SUFFIX = ".env.npz"
+
+
+class Envelope:
+    """RMS levels (uint8, 255 = loudest hop) of one clip"""
+    def __init__(self, levels, hop=ENVELOPE_HOP, duration=None):
+        self.levels = levels
+        self.hop = hop
+        self.duration = len(levels) * hop if duration is None else duration
+        self._times = []
+        self._open = []
+        self._mouth_changes()
+
+    def _mouth_changes(self):
+        is_open = False
+        since = -MOUTH_HOLD
+        for i, level in enumerate(self.levels):
+            t = i * self.hop
+            if t - since < MOUTH_HOLD:
+                continue
+            if (not is_open and level >= MOUTH_OPEN * 255) or (is_open and level < MOUTH_CLOSE * 255):
+                is_open = not is_open
+                since = t
+                self._times.append(t)
+                self._open.append(is_open)
+
+    def mouth_at(self, t):
+        """(mouth open?, time of the next change - or the end of the clip) at t seconds into the clip"""
+        # A change less than a millisecond ahead counts as reached - timers fire at ms resolution
+        i = bisect.bisect_right(self._times, t + 0.001)
+        is_open = self._open[i - 1] if i else False
+        until = self._times[i] if i < len(self._times) else self.duration
+        return is_open, until
+
+
+def _read_wav(path):
+    with wave.open(path, "rb") as w:
+        channels, width, rate = w.getnchannels(), w.getsampwidth(), w.getframerate()
+        raw = w.readframes(w.getnframes())
+    if width == 3:
+        # 24 bit - widen to int32 (sign from the top byte)
+        b = np.frombuffer(raw, np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = (b[:, 0] << 8 | b[:, 1] << 16 | b[:, 2] << 24) >> 8
+    elif width == 1:
+        samples = np.frombuffer(raw, np.uint8).astype(np.int32) - 128
+    else:
+        samples = np.frombuffer(raw, {2: np.int16, 4: np.int32}[width])
+    return samples.reshape(-1, channels), rate
+
+
+def sound_samples(sound):
+    """(samples, rate) of a pygame Sound - in the mixer's format, which must be initialised"""
+    import pygame
+    rate, _, channels = pygame.mixer.get_init()
+    samples = pygame.sndarray.array(sound)
+    return samples.reshape(len(samples), -1 if channels > 1 else 1), rate
+
+
+def _read_other(path):
+    # mp3 etc. - decoded by the mixer
+    import pygame
+    return sound_samples(pygame.mixer.Sound(path))
+
+
+def analyse(samples, rate, hop=ENVELOPE_HOP):
+    """Envelope of (n, channels) or (n,) samples"""
+    mono = samples.astype(np.float32)
+    if mono.ndim > 1:
+        mono = mono.mean(axis=1)
+    step = max(1, int(rate * hop))
+    n = len(mono) // step
+    duration = len(mono) / rate
+    if n == 0:
+        return Envelope(np.zeros(0, np.uint8), hop, duration)
+    rms = np.sqrt(np.mean(mono[:n * step].reshape(n, step) ** 2, axis=1))
+    peak = rms.max()
+    levels = np.round(rms / peak * 255) if peak > 0 else np.zeros(n)
+    return Envelope(levels.astype(np.uint8), hop, duration)
+
+
+def load_envelope(path):
+    """Envelope of an audio file, from its cache next to it when up to date (None if unreadable)"""
+    cache = path + CACHE_SUFFIX
+    try:
+        if os.path.getmtime(cache) >= os.path.getmtime(path):
+            with np.load(cache) as data:
+                return Envelope(data["levels"], float(data["hop"]), float(data["duration"]))
+    except (OSError, ValueError, KeyError):
+        pass
+
+    try:
+        if path.lower().endswith(".wav"):
+            samples, rate = _read_wav(path)
+        else:
+            samples, rate = _read_other(path)
+        envelope = analyse(samples, rate)
+    except Exception as e:
+        print(f"Envelope analysis failed {path}: {e}")
+        return None
+
+    try:
+        tmp = cache[:-len(".npz")] + ".tmp.npz"
+        np.savez(tmp, levels=envelope.levels, hop=envelope.hop, duration=envelope.duration)
+        os.replace(tmp, cache)
+    except OSError as e:
+        print(f"Envelope cache write failed: {e}")
+    return envelope
+
+
+class EnvelopeBank:
+    """Envelopes of a set of clips, analysed in the background"""
+    def __init__(self):
+        self._envelopes = {}
+        self._lock = threading.Lock()
+
+    def preload(self, paths):
+        paths = list(paths)
+
+        def _run():
+            for path in paths:
+                self.get(path)
+
+        threading.Thread(target=_run, daemon=True).start()
+
+    def get(self, path):
+        with self._lock:
+            if path in self._envelopes:
+                return self._envelopes[path]
+        envelope = load_envelope(path)
+        with self._lock:
+            self._envelopes[path] = envelope
+        return envelope
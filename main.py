@@ -1,11 +1,16 @@
+import signal
+import time
 import customtkinter as ctk
-from animation_module import AnimationView
-from home_module import HomeView
+from animation_module import AnimationView, preload_animation_frames, preload_voice_lines
+from home_module import HomeView, clear_image_cache
 from chat_module import ChatView
 from quiz import QuizView
 from setting_module import SettingsView 
 from info_module import InfoView
-from presence_detector import shutdown_camera
+from presence_detector import get_camera, get_detector, shutdown_camera
+from frame_recorder import recorder_from_env
+from presence_service import PresenceService
+from audio_service import get_audio_service
 
 SKIP_INTRO = False
 IS_FULLSCREEN = True
@@ -28,9 +33,25 @@ class MainController(ctk.CTk):
         ctk.set_default_color_theme("blue")
         
         self.current_view = None
+        self.prepared_view = None
         
         self.bind("<Escape>", self.close_app)
         
+        # Mascot frames are decoded once for the whole app, in the background
+        preload_animation_frames(self)
+        # ... and so are the voice lines, played from memory on their own channel
+        preload_voice_lines()
+        
+        # Goes back to the animation (and frees what the views hold) when everybody left
+        self.presence = PresenceService(self)
+        self.presence.subscribe(self.on_visitor_left)
+        
+        # Optional in-memory clip recorder (PRESENCE_RECORDER=1), dumps on trigger or SIGUSR1
+        self.recorder = recorder_from_env(get_camera(), get_detector())
+        if self.recorder:
+            self.recorder.start()
+            signal.signal(signal.SIGUSR1, lambda *_: self.recorder.request_dump("manual"))
+        
         # Start with Animation
         if SKIP_INTRO:
             self.show_home()
@@ -45,8 +66,32 @@ class MainController(ctk.CTk):
                 self.current_view.cleanup()
             self.current_view.destroy()
             
-        # 2. Create new view (resumes detection if AnimationView)
-        self.current_view = new_view_class(parent=self, controller=self)
+        # 2. Create new view (resumes detection if AnimationView), or show the pre-built one
+        prepared = self.prepared_view
+        if prepared is not None and type(prepared) is new_view_class and prepared.winfo_exists():
+            self.prepared_view = None
+            prepared.activate()
+            self.current_view = prepared
+        else:
+            self.current_view = new_view_class(parent=self, controller=self)
+
+    def prepare_view(self, view_class):
+        """
+        Build a view in the background (hidden) so switching to it later is instant.
+        Only views with activate() support it; one view is kept prepared at a time.
+        """
+        if not hasattr(view_class, "activate"):
+            return
+        if self.prepared_view is not None:
+            if type(self.prepared_view) is view_class and self.prepared_view.winfo_exists():
+                return
+            self.prepared_view.destroy()
+        started = time.perf_counter()
+        self.prepared_view = view_class(parent=self, controller=self, activate=False)
+        print(f"Prepared {view_class.__name__} in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def prepare_home(self):
+        self.prepare_view(HomeView)
 
     def show_animation(self):
         self._switch_view(AnimationView)
@@ -68,6 +113,19 @@ class MainController(ctk.CTk):
     def show_info(self):
         self._switch_view(InfoView)
         
+    def on_visitor_left(self):
+        """Nobody in front of the kiosk for a while - drop the session and heavy resources"""
+        if not isinstance(self.current_view, AnimationView):
+            print("Visitor left - returning to animation")
+            self.show_animation()
+        self.release_caches()
+
+    def release_caches(self):
+        if self.prepared_view is not None:
+            self.prepared_view.destroy()
+            self.prepared_view = None
+        clear_image_cache()
+
     def close_app(self, event=None):
         print("Shutting down application...")
         
@@ -76,7 +134,11 @@ class MainController(ctk.CTk):
             self.current_view.cleanup()
         
         # 2. Shutdown camera completely (only here, on app exit!)
+        self.presence.unsubscribe(self.on_visitor_left)
+        if self.recorder:
+            self.recorder.stop()
         shutdown_camera()
+        get_audio_service().shutdown()
         
         # 3. Destroy window
         self.destroy()
@@ -0,0 +1,73 @@
+"""
+Cheap motion gate in front of the face cascade.
+
+The lores frame is shrunk to a thumbnail and compared against a slowly
+updated background. The cascade only needs to run when enough pixels
+changed, while faces are still being seen, or on a slow keep-alive
+schedule so a static scene is re-checked now and then.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+MOTION_SIZE = (80, 60)          # thumbnail used for the frame difference
+MOTION_PIXEL_THRESHOLD = 18     # grey level change that counts as "moved"
+MOTION_MIN_FRACTION = 0.01      # share of thumbnail pixels that must move
+MOTION_BACKGROUND_RATE = 0.05   # how fast the background follows the scene
+MOTION_HOLD = 1.5               # keep detecting this long after the last motion
+MOTION_KEEPALIVE = 2.0          # run the cascade at least this often anyway
+
+
+class MotionGate:
+    def __init__(self, size=MOTION_SIZE, keepalive=MOTION_KEEPALIVE, hold=MOTION_HOLD):
+        self.size = size
+        self.keepalive = keepalive
+        self.hold = hold
+        w, h = size
+        # All working buffers are allocated once
+        self._small = np.zeros((h, w), np.uint8)
+        self._background = np.zeros((h, w), np.float32)
+        self._background_u8 = np.zeros((h, w), np.uint8)
+        self._diff = np.zeros((h, w), np.uint8)
+        self._min_pixels = max(1, int(w * h * MOTION_MIN_FRACTION))
+        self.reset()
+
+    def reset(self):
+        self._has_background = False
+        self._last_motion = 0.0
+        self._last_run = 0.0
+        self._faces_visible = False
+        self.motion_pixels = 0
+
+    def should_detect(self, grey_frame, now=None):
+        """Update the background with this frame and decide if the cascade should run"""
+        if now is None:
+            now = time.monotonic()
+
+        cv2.resize(grey_frame, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+
+        if not self._has_background:
+            self._background[:] = self._small
+            self._has_background = True
+            self._last_motion = now
+        else:
+            cv2.convertScaleAbs(self._background, dst=self._background_u8)
+            cv2.absdiff(self._small, self._background_u8, dst=self._diff)
+            cv2.threshold(self._diff, MOTION_PIXEL_THRESHOLD, 255, cv2.THRESH_BINARY, dst=self._diff)
+            self.motion_pixels = cv2.countNonZero(self._diff)
+            if self.motion_pixels >= self._min_pixels:
+                self._last_motion = now
+            cv2.accumulateWeighted(self._small, self._background, MOTION_BACKGROUND_RATE)
+
+        run = (self._faces_visible
+               or now - self._last_motion <= self.hold
+               or now - self._last_run >= self.keepalive)
+        if run:
+            self._last_run = now
+        return run
+
+    def report_faces(self, found):
+        """Keep the gate open while the cascade still finds faces (people standing still)"""
+        self._faces_visible = bool(found)
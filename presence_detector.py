@@ -10,8 +10,23 @@ import threading
 import os
 import atexit
 
-import cv2
-from picamera2 import MappedArray, Picamera2, Preview
+import numpy as np
+
+try:
+    from picamera2 import MappedArray, Picamera2, Preview
+except ImportError:
+    # Off-device (replay / benchmarks) - only the replay camera source is usable
+    MappedArray = Picamera2 = Preview = None
+
+from camera_source import CameraSource, FRAME_WAIT_TIMEOUT, replay_from_env
+from camera_watchdog import CameraWatchdog
+from face_pipeline import FacePipeline
+from face_backends import get_backend
+from detector_worker import get_detector_process
+from approach_signal import ApproachDetector, APPROACH_MIN_RATIO
+from presence_filter import FALSE_TRIGGER_WINDOW, PresenceFilter, ENTER, EXIT
+from preview_overlay import (OverlayCost, build_overlay,
+                             STATUS_IDLE, STATUS_LOOKING, STATUS_TRIGGERED)
 
 # --- CONFIGURATION ---
 FACE_AREA_THRESHOLD = 0.20
@@ -19,14 +34,36 @@ TIME_TO_TRIGGER = 1.0
 PREVIEW_SIZE = (640, 480)
 DETECT_SIZE = (320, 240)
 
-CASCADE_PATHS = [
-    "/usr/share/opencv4/haarcascades/haarcascade_frontalface_default.xml",
-    "/usr/share/opencv/haarcascades/haarcascade_frontalface_default.xml",
-    "haarcascade_frontalface_default.xml",
-]
+# "event": detector is woken by Picamera2 request completion (latest frame wins)
+# "poll": detector pulls frames itself with capture_buffer()
+FRAME_DELIVERY = "event"
+STATS_INTERVAL = 10.0      # seconds between detection FPS / frame age reports
+MOTION_GATE = True         # skip the cascade while the scene is static
+FACE_TRACKING = True       # search around known faces, full-frame rescan periodically
+# Temporal filter (see presence_filter.py): presence is left only below the exit
+# ratio, and a face may go missing for a few detection results without resetting it
+PRESENCE_EXIT_RATIO = FACE_AREA_THRESHOLD * 0.8
+PRESENCE_MISS_TOLERANCE = 3
+PRESENCE_SMOOTHING = 0.4
+# Report "approaching" while a face grows steadily under the threshold (see approach_signal.py)
+APPROACH_SIGNAL = True
+# Faces smaller than this never reach FACE_AREA_THRESHOLD - don't search for them
+# (some slack because cascade boxes jump between scale steps). The approach
+# signal needs to see faces from further away.
+MIN_FACE_AREA_RATIO = FACE_AREA_THRESHOLD * 0.7
+if APPROACH_SIGNAL:
+    MIN_FACE_AREA_RATIO = min(MIN_FACE_AREA_RATIO, APPROACH_MIN_RATIO)
 
+# Face detector: "haar", "lbp", "yunet" or "ssd" (see face_backends.py)
+FACE_BACKEND = os.getenv("FACE_BACKEND", "haar")
+# Run the face search in a worker process reading frames from shared memory,
+# so detectMultiScale doesn't compete with Tk / animation / TTS for the GIL
+DETECTION_PROCESS = os.getenv("DETECTION_PROCESS", "0") == "1"
+OVERLAY_PROFILE = False    # measure what the preview overlay costs per frame
+CAMERA_WATCHDOG = True     # re-acquire a stalled / busy camera without restarting the app
 
-class CameraSingleton:
+
+class CameraSingleton(CameraSource):
     """
     Singleton camera manager - camera is initialized ONCE and stays running.
     This prevents the 'Device busy' error when switching views.
@@ -45,17 +82,21 @@ class CameraSingleton:
     def __init__(self):
         if self._initialized:
             return
-            
+        
+        super().__init__()
         self.picam2 = None
-        self.running = False
-        self.w0 = self.h0 = 0
-        self.w1 = self.h1 = 0
         self.stride = 0
+        self.watchdog = CameraWatchdog(self) if CAMERA_WATCHDOG else None
+        self._restart_lock = threading.Lock()
         self._initialized = True
         
         # Register cleanup on program exit
         atexit.register(self.shutdown)
     
+    @property
+    def recovering(self):
+        return self.watchdog is not None and self.watchdog.running
+    
     def start(self):
         """Start camera (only once for entire app lifetime)"""
         if self.running:
@@ -63,6 +104,16 @@ class CameraSingleton:
             return True
             
         print("Starting camera singleton...")
+        if Picamera2 is None:
+            print("Camera start error: picamera2 is not installed")
+            return False
+        # From here on a failed or stalled camera is retried in the background
+        if self.watchdog:
+            self.watchdog.start()
+        with self._restart_lock:
+            return self._open()
+    
+    def _open(self):
         try:
             self.picam2 = Picamera2()
             
@@ -79,6 +130,11 @@ class CameraSingleton:
             
             print(f"Preview: {self.w0}x{self.h0}, Detection: {self.w1}x{self.h1}")
             
+            self._ensure_ring()
+            
+            # Every completed request goes through _on_request (frames + overlay)
+            self.picam2.post_callback = self._on_request
+            
             self.picam2.start_preview(Preview.QTGL)
             self.picam2.start()
             
@@ -88,45 +144,96 @@ class CameraSingleton:
             
         except Exception as e:
             print(f"Camera start error: {e}")
-            import traceback
-            traceback.print_exc()
+            self._close()
+            if not self.watchdog:
+                import traceback
+                traceback.print_exc()
             return False
     
+    def _close(self):
+        """Release the device (frame ring and shared memory stay for the next _open)"""
+        picam2, self.picam2 = self.picam2, None
+        if picam2 is None:
+            return
+        try:
+            picam2.stop_preview()
+        except Exception:
+            pass
+        try:
+            picam2.stop()
+        except Exception:
+            pass
+        try:
+            picam2.close()
+        except Exception:
+            pass
+    
+    def _reacquire(self):
+        """Watchdog: close the (stalled or never opened) device and open it again"""
+        with self._restart_lock:
+            self.running = False
+            self._close()
+            return self._open()
+    
+    def _on_request(self, request):
+        """Picamera2 request completion - publish lores Y plane, then draw overlay"""
+        if FRAME_DELIVERY == "event" and self.frame_ring is not None:
+            try:
+                with MappedArray(request, "lores") as m:
+                    buffer = m.array.reshape(-1)
+                    grey = buffer[:self.stride * self.h1].reshape((self.h1, self.stride))
+                    self._publish(grey[:, :self.w1], time.monotonic(), self._sensor_time(request))
+            except Exception as e:
+                print(f"Frame publish error: {e}")
+        else:
+            # Poll mode only publishes what detection pulls - the watchdog still has to see
+            # every frame, or paused detection looks like a dead camera
+            self.telemetry.record(time.monotonic(), self._sensor_time(request))
+        
+        callback = self.overlay_callback
+        if callback:
+            callback(request)
+    
+    @staticmethod
+    def _sensor_time(request):
+        """Start of exposure readout in time.monotonic() seconds (libcamera uses CLOCK_MONOTONIC)"""
+        try:
+            return request.get_metadata()["SensorTimestamp"] / 1e9
+        except Exception:
+            return None
+    
     def get_detection_frame(self):
-        """Get grayscale frame for face detection"""
-        if not self.running or not self.picam2:
+        """Capture a grayscale frame for face detection (blocking, poll mode) -> borrowed FrameRef"""
+        if not self.running or not self.picam2 or self.frame_ring is None:
             return None
         try:
             buffer = self.picam2.capture_buffer("lores")
             grey = buffer[:self.stride * self.h1].reshape((self.h1, self.stride))
-            return grey[:, :self.w1].copy()
+            # Already recorded in the telemetry by _on_request
+            self._publish(grey[:, :self.w1], time.monotonic(), record=False)
+            return self.frame_ring.borrow_latest()
         except:
             return None
     
-    def set_overlay_callback(self, callback):
-        """Set the drawing callback"""
-        if self.picam2:
-            self.picam2.post_callback = callback
-    
-    def clear_overlay_callback(self):
-        """Remove drawing callback"""
-        if self.picam2:
-            self.picam2.post_callback = None
+    def get_stats(self):
+        stats = super().get_stats()
+        stats["camera_running"] = self.running
+        stats["camera_recovering"] = self.recovering and not self.running
+        return stats
     
     def shutdown(self):
         """Full shutdown - only call on app exit"""
-        if not self.running:
+        if self.watchdog:
+            self.watchdog.stop()
+        if not self.running and self.picam2 is None:
             return
         print("Shutting down camera...")
         self.running = False
-        if self.picam2:
-            try:
-                self.picam2.stop_preview()
-                self.picam2.stop()
-                self.picam2.close()
-            except:
-                pass
-            self.picam2 = None
+        if self.frame_ring is not None:
+            self.frame_ring.clear()
+        self._release_shared_frames()
+        with self._restart_lock:
+            self._close()
         print("Camera shutdown complete")
 
 
@@ -134,119 +241,389 @@ class CameraSingleton:
 _camera = None
 
 def get_camera():
-    """Get the singleton camera instance"""
+    """Get the singleton camera instance (replay source if CAMERA_REPLAY is set)"""
     global _camera
     if _camera is None:
-        _camera = CameraSingleton()
+        _camera = replay_from_env() or CameraSingleton()
+    return _camera
+
+
+def set_camera(source):
+    """Use another CameraSource (e.g. ReplaySource) - call before creating detectors"""
+    global _camera
+    _camera = source
     return _camera
 
 
+class DetectionStats:
+    """Effective detection FPS, frame age and per-frame cost, reported every STATS_INTERVAL seconds"""
+    def __init__(self, interval=STATS_INTERVAL, keep_latencies=False):
+        self.interval = interval
+        self.fps = 0.0
+        self.cascade_fps = 0.0
+        self.frame_age_ms = 0.0
+        self.process_ms = 0.0
+        self.dropped = 0
+        self.frames_total = 0
+        # Benchmarks keep every per-frame processing time (ms) for percentiles
+        self.latencies = [] if keep_latencies else None
+        self.reset()
+    
+    def reset(self):
+        self._window_start = time.monotonic()
+        self._frames = 0
+        self._cascade_runs = 0
+        self._age_total = 0.0
+        self._process_total = 0.0
+        self._dropped_base = None
+    
+    def add_cascade_run(self):
+        self._cascade_runs += 1
+    
+    def add(self, frame_age, process_time, dropped_total=0):
+        """Count one processed frame - returns True when a report was printed"""
+        now = time.monotonic()
+        if self._dropped_base is None:
+            self._dropped_base = dropped_total
+        self._frames += 1
+        self.frames_total += 1
+        self._age_total += frame_age
+        self._process_total += process_time
+        if self.latencies is not None:
+            self.latencies.append(process_time * 1000)
+        
+        elapsed = now - self._window_start
+        if elapsed >= self.interval:
+            self.fps = self._frames / elapsed
+            self.cascade_fps = self._cascade_runs / elapsed
+            self.frame_age_ms = self._age_total / self._frames * 1000
+            self.process_ms = self._process_total / self._frames * 1000
+            self.dropped = dropped_total - self._dropped_base
+            print(f"Detection: {self.fps:.1f} fps (cascade {self.cascade_fps:.1f}/s), "
+                  f"frame age {self.frame_age_ms:.1f} ms, {self.process_ms:.1f} ms/frame, dropped {self.dropped}")
+            self.reset()
+            return True
+        return False
+    
+    def as_dict(self):
+        return {"fps": self.fps, "cascade_fps": self.cascade_fps, "frame_age_ms": self.frame_age_ms,
+                "process_ms": self.process_ms, "dropped": self.dropped}
+
+
 class PresenceDetector:
     """
     Face presence detector - uses the singleton camera.
     Can be started/stopped multiple times without affecting camera.
+    The app shares one instance (get_detector()); views attach/detach callbacks.
     """
     def __init__(self, on_detect_callback=None):
         self.on_detect_callback = on_detect_callback
+        self.detect_callbacks = []
+        self.approach_callbacks = []
+        self.event_callbacks = []
+        self._callbacks_lock = threading.Lock()
         self.face_detector = None
         self.detection_active = False
         self.detection_thread = None
+        self._generation = 0
         
         # Detection state
         self.faces = []
-        self.start_look_time = None
-        self.action_triggered = False
+        self.last_face_time = None  # monotonic time a face was last seen (any size)
+        self.presence = PresenceFilter(FACE_AREA_THRESHOLD, TIME_TO_TRIGGER, PRESENCE_EXIT_RATIO,
+                                       PRESENCE_SMOOTHING, PRESENCE_MISS_TOLERANCE)
+        self.last_event = None
+        self._rearm = False         # attach(): reset the presence / approach filters on the next result
+        self.approach = ApproachDetector(FACE_AREA_THRESHOLD) if APPROACH_SIGNAL else None
+        self.stats = DetectionStats()
+        
+        # Preview overlay - immutable layer swapped in only when the result changes
+        self.overlay = None
+        self._overlay_canvas = None
+        self.overlay_cost = OverlayCost()
+        self.overlay_cost.enabled = OVERLAY_PROFILE
         
         # Get camera singleton
         self.camera = get_camera()
         
-        self._load_cascade()
-    
-    def _load_cascade(self):
-        for path in CASCADE_PATHS:
-            if os.path.exists(path):
-                self.face_detector = cv2.CascadeClassifier(path)
-                if not self.face_detector.empty():
-                    print(f"Loaded cascade: {path}")
-                    return True
-        print("ERROR: Could not load face cascade!")
-        return False
+        side = int((MIN_FACE_AREA_RATIO * DETECT_SIZE[0] * DETECT_SIZE[1]) ** 0.5)
+        self.min_face_size = (side, side)
+        
+        # In-process pipeline, or a handle to the shared worker process
+        self.pipeline = None
+        self.worker = None
+        if DETECTION_PROCESS:
+            self.worker = get_detector_process(FACE_BACKEND, self.min_face_size, MOTION_GATE, FACE_TRACKING)
+        else:
+            self._create_pipeline()
+    
+    def _create_pipeline(self):
+        """Load the configured backend and build the in-process face pipeline"""
+        self.face_detector = get_backend(FACE_BACKEND)
+        if self.face_detector is None:
+            return False
+        self.pipeline = FacePipeline(self.face_detector, DETECT_SIZE, self.min_face_size,
+                                     MOTION_GATE, FACE_TRACKING)
+        return True
     
     def _draw_overlay(self, request):
-        """Draw face boxes on preview"""
-        if not self.detection_active:
+        """Draw face boxes on preview (camera thread - only copies the prepared layer)"""
+        layer = self.overlay
+        if layer is None:
             return
-            
+        
+        started = self.overlay_cost.start()
         with MappedArray(request, "main") as m:
-            frame = m.array
-            
-            for (x, y, w, h) in self.faces:
-                x_s = x * self.camera.w0 // self.camera.w1
-                y_s = y * self.camera.h0 // self.camera.h1
-                w_s = w * self.camera.w0 // self.camera.w1
-                h_s = h * self.camera.h0 // self.camera.h1
-                
-                face_area = w * h
-                total_area = self.camera.w1 * self.camera.h1
-                ratio = face_area / total_area
-                
-                color = (0, 255, 0, 255) if ratio >= FACE_AREA_THRESHOLD else (0, 255, 255, 255)
-                cv2.rectangle(frame, (x_s, y_s), (x_s + w_s, y_s + h_s), color, 2)
-                cv2.putText(frame, f"{ratio:.0%}", (x_s, y_s - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-            
-            # Status indicator
-            if self.action_triggered:
-                cv2.circle(frame, (30, 30), 20, (0, 0, 255, 255), -1)
-            elif self.start_look_time:
-                cv2.circle(frame, (30, 30), 20, (0, 255, 255, 255), 2)
-            else:
-                cv2.circle(frame, (30, 30), 20, (0, 255, 0, 255), 2)
+            layer.blit(m.array)
+        self.overlay_cost.stop(started)
     
-    def _process_detection(self, grey_frame):
-        if not self.detection_active or self.face_detector is None:
+    def _publish_overlay(self):
+        """Rebuild the overlay layer if the detection result changed (detection thread)"""
+        if self.presence.present:
+            status = STATUS_TRIGGERED
+        elif self.presence.look_start:
+            status = STATUS_LOOKING
+        else:
+            status = STATUS_IDLE
+        
+        faces = [tuple(int(v) for v in f) for f in self.faces]
+        current = self.overlay
+        if current is not None and current.key == (tuple(faces), status):
             return
+        if not self.camera.w1 or not self.camera.w0:
+            return
+        if self._overlay_canvas is None:
+            self._overlay_canvas = np.zeros((self.camera.h0, self.camera.w0, 4), np.uint8)
         
-        self.faces = self.face_detector.detectMultiScale(grey_frame, 1.1, 5)
+        layer = build_overlay(faces, status, (self.camera.w1, self.camera.h1),
+                              (self.camera.w0, self.camera.h0), FACE_AREA_THRESHOLD,
+                              self._overlay_canvas)
+        self.overlay = layer
+        self.overlay_cost.rebuilds += 1
+    
+    def set_overlay_profiling(self, enabled):
+        """Toggle the overlay cost counter (shown in get_stats())"""
+        self.overlay_cost.reset()
+        self.overlay_cost.enabled = enabled
+    
+    def _process_detection(self, grey_frame):
+        if not self.detection_active or self.pipeline is None:
+            return
+        self._update_presence(self.pipeline.process(grey_frame))
+    
+    def _process_in_worker(self, frame):
+        """Same as _process_detection, with the face search done by the worker process"""
+        if not self.detection_active:
+            return
+        self._update_presence(self.worker.detect(frame))
+    
+    def _update_presence(self, faces):
+        """Trigger logic on the face boxes of one frame (None = frame skipped by the motion gate)"""
+        if self._rearm:
+            self._rearm = False
+            self.presence.reset()
+            if self.approach:
+                self.approach.reset()
+        if faces is None:
+            return
+        self.faces = faces
+        self.stats.add_cascade_run()
+        if faces:
+            self.last_face_time = time.monotonic()
         
-        face_found_close = False
         total_area = self.camera.w1 * self.camera.h1
+        largest = max((w * h for (x, y, w, h) in self.faces), default=0) / total_area
         
-        for (x, y, w, h) in self.faces:
-            if (w * h) / total_area >= FACE_AREA_THRESHOLD:
-                face_found_close = True
-                break
+        if self.approach and not self.presence.present and self.approach.update(largest):
+            print(f">> APPROACHING ({largest:.0%})")
+            self._notify_approach()
         
-        if face_found_close:
-            if self.start_look_time is None:
-                self.start_look_time = time.time()
-            
-            if time.time() - self.start_look_time >= TIME_TO_TRIGGER:
-                if not self.action_triggered:
-                    print(">> PRESENCE CONFIRMED!")
-                    if self.on_detect_callback:
-                        try:
-                            self.on_detect_callback()
-                        except Exception as e:
-                            print(f"Callback error: {e}")
-                    self.action_triggered = True
-        else:
-            self.start_look_time = None
-            self.action_triggered = False
+        # Smoothed, hysteresis-filtered presence - no reset on a single missed frame
+        event = self.presence.update(self.faces, total_area)
+        if event:
+            self.last_event = event
+            if event.kind == ENTER:
+                print(f">> PRESENCE CONFIRMED! (confidence {event.confidence:.2f})")
+                self._notify_detect()
+            elif event.kind == EXIT:
+                print(f">> Presence lost ({event.ratio:.0%})")
+            self._notify_event(event)
+        
+        self._publish_overlay()
+    
+    def _notify_detect(self):
+        with self._callbacks_lock:
+            callbacks = list(self.detect_callbacks)
+        if self.on_detect_callback:
+            callbacks.insert(0, self.on_detect_callback)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Callback error: {e}")
+    
+    def _notify_event(self, event):
+        with self._callbacks_lock:
+            callbacks = list(self.event_callbacks)
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Presence event callback error: {e}")
+    
+    def attach_events(self, callback):
+        """Register callback(PresenceEvent) for stable enter/exit events (detection thread)"""
+        with self._callbacks_lock:
+            if callback not in self.event_callbacks:
+                self.event_callbacks.append(callback)
+    
+    def detach_events(self, callback):
+        with self._callbacks_lock:
+            if callback in self.event_callbacks:
+                self.event_callbacks.remove(callback)
+    
+    def _notify_approach(self):
+        with self._callbacks_lock:
+            callbacks = list(self.approach_callbacks)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Approach callback error: {e}")
     
-    def _detection_loop(self):
+    def attach_approach(self, callback):
+        """
+        Register a callback for "a face is coming closer" (detection thread, before on-detect).
+        Doesn't start detection by itself - it only fires while someone is attached.
+        """
+        with self._callbacks_lock:
+            if callback not in self.approach_callbacks:
+                self.approach_callbacks.append(callback)
+    
+    def detach_approach(self, callback):
+        with self._callbacks_lock:
+            if callback in self.approach_callbacks:
+                self.approach_callbacks.remove(callback)
+    
+    def attach(self, callback):
+        """Register an on-detect callback and make sure detection is running"""
+        with self._callbacks_lock:
+            if callback not in self.detect_callbacks:
+                self.detect_callbacks.append(callback)
+        # A newly attached view should get its own wake-up if someone is already there -
+        # the filters are reset by the detection thread (_update_presence), never under its feet
+        self._rearm = True
+        self.start()
+    
+    def detach(self, callback):
+        """Remove a callback - detection pauses when nobody is listening anymore"""
+        with self._callbacks_lock:
+            if callback in self.detect_callbacks:
+                self.detect_callbacks.remove(callback)
+            idle = not self.detect_callbacks and self.on_detect_callback is None
+        if idle:
+            self.stop()
+    
+    def _detection_loop(self, generation):
         """Detection loop - runs in background thread"""
-        print("Detection loop started")
-        while self.detection_active:
+        print(f"Detection loop started ({FRAME_DELIVERY} mode{', worker process' if self.worker else ''})")
+        last_sequence = 0
+        # A restarted detector gets a new generation - a slow old loop must not keep running
+        while self.detection_active and self._generation == generation:
             try:
-                grey = self.camera.get_detection_frame()
-                if grey is not None:
-                    self._process_detection(grey)
-                time.sleep(0.033)  # ~30fps
+                if self.worker:
+                    if self.worker.conn is None:
+                        # Camera wasn't up when detection started, or the worker died
+                        if not self.camera.running:
+                            time.sleep(FRAME_WAIT_TIMEOUT)
+                            continue
+                        if not self._start_worker():
+                            if not self._fall_back_in_process():
+                                break
+                            continue
+                    # Frame stays borrowed (not overwritten) while the worker reads it from shared memory
+                    started = time.monotonic()
+                    if FRAME_DELIVERY == "event":
+                        frame = self.camera.borrow_frame(last_sequence)
+                    else:
+                        # Poll mode: nothing publishes on its own - capture into the shared ring here
+                        frame = self.camera.get_detection_frame()
+                    if frame is not None:
+                        with frame:
+                            last_sequence = frame.sequence
+                            picked = time.monotonic()
+                            self._process_in_worker(frame)
+                            self._add_stats(frame, picked, self.camera.frame_ring.dropped)
+                    if FRAME_DELIVERY != "event":
+                        time.sleep(max(0.0, 0.033 - (time.monotonic() - started)))
+                elif FRAME_DELIVERY == "event":
+                    # Woken by the camera - always gets the newest frame, older ones are dropped
+                    frame = self.camera.borrow_frame(last_sequence)
+                    if frame is None:
+                        continue
+                    with frame:
+                        last_sequence = frame.sequence
+                        picked = time.monotonic()
+                        self._process_detection(frame.array)
+                        self._add_stats(frame, picked, self.camera.frame_ring.dropped)
+                else:
+                    started = time.monotonic()
+                    frame = self.camera.get_detection_frame()
+                    if frame is not None:
+                        with frame:
+                            picked = time.monotonic()
+                            self._process_detection(frame.array)
+                            self._add_stats(frame, picked)
+                    time.sleep(max(0.0, 0.033 - (time.monotonic() - started)))
             except Exception as e:
+                print(f"Detection error: {e}")
+                if self.worker and self.camera.running:
+                    try:
+                        restarted = self._start_worker()
+                    except Exception as e:
+                        print(f"Detector worker restart failed: {e}")
+                        restarted = False
+                    if not restarted:
+                        if not self._fall_back_in_process():
+                            break
+                        continue
                 time.sleep(0.1)
         print("Detection loop stopped")
     
+    def _fall_back_in_process(self):
+        """Worker can't be (re)started - detect in this process; False (detection off) if that fails too"""
+        print("Detector worker unavailable - detecting in-process")
+        self.worker = None
+        if self._create_pipeline():
+            return True
+        print("No face backend - detection stopped")
+        # Not left half-active: a later start()/attach() can try again
+        self.detection_active = False
+        return False
+    
+    def _add_stats(self, frame, picked, dropped_total=0):
+        if self.stats.add(picked - frame.timestamp, time.monotonic() - picked, dropped_total):
+            p = self.presence
+            print(f"Presence: {p.enters} confirmed, {p.false_triggers} false triggers "
+                  f"(left within {FALSE_TRIGGER_WINDOW:.0f} s), "
+                  f"{p.candidates_dropped} candidates dropped, {dropped_total} frames dropped in total")
+    
+    def _start_worker(self):
+        shm_name = self.camera.enable_shared_frames()
+        return self.worker.ensure_started(shm_name, self.camera.frame_ring.shape, self.camera.frame_ring.size)
+    
+    def get_stats(self):
+        """Last reported detection FPS / frame age / dropped frames"""
+        stats = self.stats.as_dict()
+        if self.pipeline:
+            stats.update(self.pipeline.counters())
+        if self.overlay_cost.enabled:
+            stats.update(self.overlay_cost.as_dict())
+        stats.update(self.presence.counters())
+        if self.approach:
+            stats["approach_signals"] = self.approach.signals
+        return stats
+    
     def start(self):
         """Start detection (camera must already be running)"""
         if self.detection_active:
@@ -256,20 +633,39 @@ class PresenceDetector:
         # Ensure camera is running
         if not self.camera.running:
             if not self.camera.start():
-                print("Failed to start camera")
-                return
+                if not self.camera.recovering:
+                    print("Failed to start camera")
+                    return
+                # Detection waits for frames until the watchdog gets the camera back
+                print("Camera unavailable - detection will resume once it recovers")
         
         # Reset state
         self.faces = []
-        self.start_look_time = None
-        self.action_triggered = False
+        self.presence.reset()
+        self._rearm = False
+        self.last_event = None
+        if self.approach:
+            self.approach.reset()
+        self.stats.reset()
+        if self.worker and self.camera.running:
+            if not self._start_worker():
+                print("Detector worker unavailable - detecting in-process")
+                self.worker = None
+                self._create_pipeline()
+            else:
+                self.worker.reset()
+        if self.pipeline:
+            self.pipeline.reset()
         self.detection_active = True
+        self._generation += 1
+        self.overlay = None
+        self._publish_overlay()
         
         # Set overlay callback
         self.camera.set_overlay_callback(self._draw_overlay)
         
         # Start detection thread
-        self.detection_thread = threading.Thread(target=self._detection_loop, daemon=True)
+        self.detection_thread = threading.Thread(target=self._detection_loop, args=(self._generation,), daemon=True)
         self.detection_thread.start()
         print("Detection started")
     
@@ -281,6 +677,7 @@ class PresenceDetector:
         print("Stopping detection...")
         self.detection_active = False
         self.faces = []
+        self.overlay = None
         
         # Clear overlay but DON'T stop camera
         self.camera.clear_overlay_callback()
@@ -300,8 +697,29 @@ class PresenceDetector:
         self.start()
 
 
+# Global detector instance - cascade, tracker and worker stay loaded for the app lifetime
+_detector = None
+_detector_lock = threading.Lock()
+
+def get_detector():
+    """Get the shared detector, created on first use"""
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = PresenceDetector()
+    return _detector
+
+
+def get_camera_stats():
+    """Camera frame rate, frame intervals, stalls and recoveries (see camera_watchdog.py)"""
+    return get_camera().get_stats()
+
+
 def shutdown_camera():
     """Call this only when the entire app is closing"""
     global _camera
+    if _detector:
+        _detector.stop()
     if _camera:
         _camera.shutdown()
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Temporal filter between raw face boxes and presence events.
+
+Cascades flicker: a visitor standing in front of the screen loses their
+box for a frame every now and then, and a passer-by can produce one big
+box for a frame or two. Instead of acting on every frame:
+
+  - faces are matched to short-lived tracks, each with a smoothed area
+    ratio and hit rate; a track survives MISS_TOLERANCE missed results
+  - presence is entered when the best track stays above the enter ratio
+    for the dwell time, and left only when it drops below the (lower)
+    exit ratio - hysteresis, so boxes hovering at the threshold don't
+    toggle it
+  - every enter/exit is published as a PresenceEvent with a confidence
+
+false_triggers is a heuristic: any presence that ends within
+FALSE_TRIGGER_WINDOW of being confirmed. The filter can't tell a
+passer-by's spike from a visitor who taps and leaves at once, so it is an
+upper bound - compare it between runs rather than reading it as exact.
+"""
+
+import time
+from collections import namedtuple
+
+PRESENCE_SMOOTHING = 0.4        # EMA weight of the newest box area
+PRESENCE_EXIT_FACTOR = 0.8      # exit ratio = enter ratio * this
+PRESENCE_MISS_TOLERANCE = 3     # detection results a track may miss before it's dropped
+PRESENCE_MIN_CONFIDENCE = 0.6   # hit rate needed to confirm presence
+PRESENCE_HIT_RATE = 0.3         # EMA weight of hit/miss in a track's hit rate
+PRESENCE_MATCH_DISTANCE = 0.6   # centre distance (in face widths) still counted as the same face
+# Presence lost this soon after entering counts as a false trigger - a heuristic upper
+# bound: a genuine but very short visit is counted too
+FALSE_TRIGGER_WINDOW = 2.0
+
+PresenceEvent = namedtuple("PresenceEvent", "kind confidence ratio time")
+ENTER = "enter"
+EXIT = "exit"
+
+
+class _Track:
+    __slots__ = ("cx", "cy", "width", "ratio", "hit_rate", "misses")
+
+    def __init__(self, box, ratio):
+        x, y, w, h = box
+        self.cx = x + w / 2
+        self.cy = y + h / 2
+        self.width = w
+        self.ratio = ratio
+        self.hit_rate = 1.0
+        self.misses = 0
+
+
+class PresenceFilter:
+    def __init__(self, enter_ratio, dwell, exit_ratio=None, smoothing=PRESENCE_SMOOTHING,
+                 miss_tolerance=PRESENCE_MISS_TOLERANCE, min_confidence=PRESENCE_MIN_CONFIDENCE):
+        self.enter_ratio = enter_ratio
+        self.exit_ratio = exit_ratio if exit_ratio is not None else enter_ratio * PRESENCE_EXIT_FACTOR
+        self.dwell = dwell
+        self.smoothing = smoothing
+        self.miss_tolerance = miss_tolerance
+        self.min_confidence = min_confidence
+        self.enters = 0
+        self.exits = 0
+        self.false_triggers = 0
+        self.candidates_dropped = 0
+        self.reset()
+
+    def reset(self):
+        """Forget tracks and presence state (counters are kept)"""
+        self._tracks = []
+        self.look_start = None      # best track above the enter ratio since
+        self.present_since = None   # presence confirmed since
+        self.ratio = 0.0
+        self.confidence = 0.0
+
+    @property
+    def present(self):
+        return self.present_since is not None
+
+    def _match(self, faces, frame_area):
+        unmatched = list(self._tracks)
+        tracks = []
+        for box in faces:
+            x, y, w, h = box
+            ratio = (w * h) / frame_area
+            cx, cy = x + w / 2, y + h / 2
+            best = None
+            best_distance = None
+            for track in unmatched:
+                distance = ((cx - track.cx) ** 2 + (cy - track.cy) ** 2) ** 0.5 / max(w, track.width)
+                if distance <= PRESENCE_MATCH_DISTANCE and (best is None or distance < best_distance):
+                    best, best_distance = track, distance
+            if best is None:
+                tracks.append(_Track(box, ratio))
+                continue
+            unmatched.remove(best)
+            best.cx, best.cy, best.width = cx, cy, w
+            best.ratio += self.smoothing * (ratio - best.ratio)
+            best.hit_rate += PRESENCE_HIT_RATE * (1.0 - best.hit_rate)
+            best.misses = 0
+            tracks.append(best)
+
+        for track in unmatched:
+            track.misses += 1
+            track.hit_rate -= PRESENCE_HIT_RATE * track.hit_rate
+            if track.misses <= self.miss_tolerance:
+                tracks.append(track)
+        self._tracks = tracks
+
+    def update(self, faces, frame_area, now=None):
+        """Feed the face boxes of one detection result; returns a PresenceEvent or None"""
+        if now is None:
+            now = time.monotonic()
+        self._match(faces, frame_area)
+
+        best = max(self._tracks, key=lambda t: t.ratio, default=None)
+        self.ratio = best.ratio if best else 0.0
+        self.confidence = best.hit_rate if best else 0.0
+
+        if self.present:
+            if self.ratio < self.exit_ratio:
+                if now - self.present_since < FALSE_TRIGGER_WINDOW:
+                    self.false_triggers += 1
+                self.present_since = None
+                self.look_start = None
+                self.exits += 1
+                return PresenceEvent(EXIT, self.confidence, self.ratio, now)
+            return None
+
+        if self.look_start is None:
+            if self.ratio >= self.enter_ratio:
+                self.look_start = now
+            return None
+
+        if self.ratio < self.exit_ratio:
+            self.look_start = None
+            self.candidates_dropped += 1
+            return None
+        if now - self.look_start >= self.dwell and self.confidence >= self.min_confidence:
+            self.present_since = now
+            self.enters += 1
+            return PresenceEvent(ENTER, self.confidence, self.ratio, now)
+        return None
+
+    def counters(self):
+        """Presence counters since start-up; false_triggers = exits within FALSE_TRIGGER_WINDOW of entering"""
+        return {"false_trigger_window_s": FALSE_TRIGGER_WINDOW,
+                "presence_enters": self.enters, "presence_exits": self.exits,
+                "false_triggers": self.false_triggers, "candidates_dropped": self.candidates_dropped}
@@ -0,0 +1,104 @@
+"""
+App-wide "is anybody still here?" service.
+
+Backed by the shared PresenceDetector (and so the running camera
+singleton): a visitor counts as present while faces are detected or the
+screen is being touched. After away_after seconds with neither, every
+subscriber is told once, on the Tk thread, so views can stop TTS, drop
+pending AI answers and caches, and the app can go back to the animation.
+"""
+
+import time
+
+from presence_detector import get_detector
+
+AWAY_AFTER = 45.0           # seconds without a face or a touch before views are released
+CHECK_INTERVAL_MS = 1000
+
+
+class PresenceService:
+    def __init__(self, root, away_after=AWAY_AFTER, detector=None):
+        self.root = root
+        self.away_after = away_after
+        self.detector = detector or get_detector()
+        self.subscribers = []   # (on_away, on_return)
+        self.away = False
+        self.away_count = 0
+        self._last_activity = time.monotonic()
+        self._job = None
+
+    def subscribe(self, on_away, on_return=None):
+        """on_away() when nobody has been around for away_after seconds, on_return() when someone is back"""
+        if any(cb == on_away for cb, _ in self.subscribers):
+            return
+        first = not self.subscribers
+        self.subscribers.append((on_away, on_return))
+        if first:
+            self._last_activity = time.monotonic()
+            self.away = False
+            # Keeps detection running while anyone relies on the service
+            self.detector.attach(self._on_detect)
+            self._schedule()
+
+    def unsubscribe(self, on_away):
+        self.subscribers = [(a, r) for a, r in self.subscribers if a != on_away]
+        if not self.subscribers:
+            self.detector.detach(self._on_detect)
+            if self._job is not None:
+                self.root.after_cancel(self._job)
+                self._job = None
+
+    def notify_activity(self):
+        """Views can report interaction the window system doesn't see (e.g. speech, AI replies)"""
+        self._last_activity = time.monotonic()
+
+    def _on_detect(self):
+        # Detection thread - presence confirmed counts as activity
+        self._last_activity = time.monotonic()
+
+    def _touch_idle(self):
+        """Seconds since the last touch/key/mouse event (X11 only), None if unknown"""
+        try:
+            ms = int(self.root.tk.call("tk", "inactive"))
+        except Exception:
+            return None
+        return ms / 1000.0 if ms >= 0 else None
+
+    def idle_seconds(self):
+        now = time.monotonic()
+        idle = now - self._last_activity
+        last_face = self.detector.last_face_time
+        if last_face is not None:
+            idle = min(idle, now - last_face)
+        touch = self._touch_idle()
+        if touch is not None:
+            idle = min(idle, touch)
+        return idle
+
+    def _schedule(self):
+        self._job = self.root.after(CHECK_INTERVAL_MS, self._check)
+
+    def _check(self):
+        self._job = None
+        if not self.subscribers:
+            return
+        idle = self.idle_seconds()
+        if not self.away and idle >= self.away_after:
+            self.away = True
+            self.away_count += 1
+            print(f"Nobody around for {idle:.0f} s - releasing resources")
+            self._call(0)
+        elif self.away and idle < self.away_after:
+            self.away = False
+            self._call(1)
+        self._schedule()
+
+    def _call(self, which):
+        for callbacks in list(self.subscribers):
+            callback = callbacks[which]
+            if callback is None:
+                continue
+            try:
+                callback()
+            except Exception as e:
+                print(f"Presence service callback error: {e}")
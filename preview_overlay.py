@@ -0,0 +1,99 @@
+"""
+Preview overlay for the camera window.
+
+The detection thread turns each new result into an OverlayLayer: boxes
+are scaled to preview size, area ratios and colours worked out, and
+everything is rasterized once into a list of pixels. The camera thread
+then only copies those pixels onto every preview frame - no cv2 drawing
+or text rendering per frame, and it never touches the detector's live
+state. A layer is immutable; a new result replaces the reference.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+GREEN = (0, 255, 0, 255)
+YELLOW = (0, 255, 255, 255)
+RED = (0, 0, 255, 255)
+
+STATUS_IDLE = "idle"
+STATUS_LOOKING = "looking"
+STATUS_TRIGGERED = "triggered"
+
+
+class OverlayLayer:
+    """Pixels of one detection result, ready to be copied onto preview frames"""
+    __slots__ = ("key", "ys", "xs", "pixels")
+
+    def __init__(self, key, ys, xs, pixels):
+        self.key = key
+        self.ys = ys
+        self.xs = xs
+        self.pixels = pixels
+
+    def blit(self, frame):
+        frame[self.ys, self.xs] = self.pixels
+
+
+def build_overlay(faces, status, detect_size, preview_size, threshold, canvas=None):
+    """
+    Rasterize face boxes + status dot for the preview (runs once per new result).
+    canvas is an optional (h, w, 4) scratch buffer reused between calls.
+    """
+    w1, h1 = detect_size
+    w0, h0 = preview_size
+    total_area = w1 * h1
+
+    if canvas is None or canvas.shape != (h0, w0, 4):
+        canvas = np.zeros((h0, w0, 4), np.uint8)
+    else:
+        canvas.fill(0)
+    for (x, y, w, h) in faces:
+        x_s = x * w0 // w1
+        y_s = y * h0 // h1
+        w_s = w * w0 // w1
+        h_s = h * h0 // h1
+        ratio = (w * h) / total_area
+        color = GREEN if ratio >= threshold else YELLOW
+        cv2.rectangle(canvas, (x_s, y_s), (x_s + w_s, y_s + h_s), color, 2)
+        cv2.putText(canvas, f"{ratio:.0%}", (x_s, y_s - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+
+    # Status indicator
+    if status == STATUS_TRIGGERED:
+        cv2.circle(canvas, (30, 30), 20, RED, -1)
+    elif status == STATUS_LOOKING:
+        cv2.circle(canvas, (30, 30), 20, YELLOW, 2)
+    else:
+        cv2.circle(canvas, (30, 30), 20, GREEN, 2)
+
+    ys, xs = np.nonzero(canvas[:, :, 3])
+    return OverlayLayer((tuple(faces), status), ys, xs, canvas[ys, xs])
+
+
+class OverlayCost:
+    """Optional counter for what the overlay costs on the camera thread"""
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.total = 0.0
+        self.rebuilds = 0
+
+    def start(self):
+        return time.perf_counter() if self.enabled else 0.0
+
+    def stop(self, started):
+        if self.enabled:
+            self.frames += 1
+            self.total += time.perf_counter() - started
+
+    def as_dict(self):
+        return {
+            "overlay_frames": self.frames,
+            "overlay_ms": self.total / self.frames * 1000 if self.frames else 0.0,
+            "overlay_rebuilds": self.rebuilds,
+        }
@@ -310,6 +310,8 @@ class QuizView(ctk.CTkFrame):
         self.backend.salveaza_log_json(email, spec, x, y)
         path = self.backend.genereaza_grafic(x, y)
         success, err = self.backend.trimite_mail(email, self.lang, x, y, spec, desc, path)
+        # The view may have been closed (visitor left) while the mail was being sent
+        if not self.winfo_exists(): return
         self.after(0, lambda: self.finish_process(success, spec, err))
 
     def finish_process(self, success, spec, err):
@@ -0,0 +1,117 @@
+"""
+Compare face detector backends on the same recorded frames.
+
+Usage:
+    python tools/bench_detectors.py FRAMES [--labels labels.json]
+                                   [--backends haar,lbp,yunet,ssd]
+                                   [--min-size 0] [--json results.json]
+
+FRAMES is a directory of images, a .npy stack (N, H, W), a recorded
+dataset directory or a video file (see camera_source.load_frames).
+Frames are converted to grayscale and resized to the detection size.
+labels.json is a list with one entry per frame: the number of faces
+(or true/false). With labels the hit/miss/false-alarm rates are printed,
+without them only how often each backend reported a face.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from camera_source import DETECT_SIZE, load_frames  # noqa: E402
+from face_backends import BACKENDS, load_backend  # noqa: E402
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def bench_backend(backend, frames, labels=None, min_size=0):
+    latencies = []
+    detections = []
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for frame in frames:
+        t0 = time.perf_counter()
+        faces = backend.detect(frame, (min_size, min_size), (0, 0))
+        latencies.append((time.perf_counter() - t0) * 1000)
+        detections.append(len(faces) > 0)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    latencies.sort()
+    result = {
+        "backend": backend.name,
+        "frames": len(frames),
+        "mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "max_ms": latencies[-1] if latencies else 0.0,
+        "cpu_percent": cpu / wall * 100 if wall > 0 else 0.0,
+        "face_rate": sum(detections) / len(detections) if detections else 0.0,
+    }
+
+    if labels is not None:
+        truth = [bool(v) for v in labels[:len(detections)]]
+        positives = sum(truth)
+        negatives = len(truth) - positives
+        hits = sum(1 for d, t in zip(detections, truth) if d and t)
+        false_alarms = sum(1 for d, t in zip(detections, truth) if d and not t)
+        result["hit_rate"] = hits / positives if positives else 0.0
+        result["miss_rate"] = 1 - result["hit_rate"] if positives else 0.0
+        result["false_alarm_rate"] = false_alarms / negatives if negatives else 0.0
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Face detector backend benchmark")
+    parser.add_argument("frames", help="image directory, .npy stack, dataset directory or video file")
+    parser.add_argument("--labels", help="JSON list with the face count (or bool) per frame")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="comma separated backend names")
+    parser.add_argument("--min-size", type=int, default=0, help="minimum face side in pixels")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    if not frames:
+        print(f"No frames found in {args.frames}")
+        return 1
+    labels = None
+    if args.labels:
+        with open(args.labels, "r", encoding="utf-8") as f:
+            labels = json.load(f)
+    print(f"{len(frames)} frames, {DETECT_SIZE[0]}x{DETECT_SIZE[1]}")
+
+    results = []
+    for name in args.backends.split(","):
+        backend = load_backend(name.strip())
+        if backend is None:
+            continue
+        backend.detect(frames[0], (args.min_size, args.min_size), (0, 0))  # warm-up
+        results.append(bench_backend(backend, frames, labels, args.min_size))
+
+    print(f"\n{'backend':8} {'mean':>7} {'p50':>7} {'p95':>7} {'max':>7} {'cpu%':>6} {'face%':>6}"
+          + (f" {'hit%':>6} {'miss%':>6} {'fa%':>6}" if labels is not None else ""))
+    for r in results:
+        line = (f"{r['backend']:8} {r['mean_ms']:7.2f} {r['p50_ms']:7.2f} {r['p95_ms']:7.2f} "
+                f"{r['max_ms']:7.2f} {r['cpu_percent']:6.0f} {r['face_rate'] * 100:6.1f}")
+        if labels is not None:
+            line += f" {r['hit_rate'] * 100:6.1f} {r['miss_rate'] * 100:6.1f} {r['false_alarm_rate'] * 100:6.1f}"
+        print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+        print(f"\nResults saved to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Presence detection benchmark on recorded walk-up scenarios.
+
+Every scenario clip is replayed headlessly through the real
+PresenceDetector (motion gate, tracking, backend - whatever is
+configured) and measured:
+
+  - detection FPS and p50/p99 per-frame processing time
+  - time from the first "close" frame to on_detect_callback, and how much
+    of that is overhead on top of TIME_TO_TRIGGER
+  - wake-ups that should not have happened (false wakes)
+  - how long before the wake-up the "approaching" signal came (lead)
+  - CPU time used while the clip played
+
+Usage:
+    python tools/bench_presence.py [tools/presence_scenarios.json]
+                                   [--speed realtime|max] [--json out.json]
+                                   [--compare previous.json]
+
+Scenario manifest: a JSON list of
+    {"name": ..., "path": clip, "expect_trigger": bool, "close_from": frame index}
+where path is anything camera_source.load_frames understands (relative
+to the manifest) and close_from is the first frame with a face above
+FACE_AREA_THRESHOLD. Use realtime speed for trigger timings - the
+trigger logic runs on wall-clock time, max speed only measures throughput.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import presence_detector  # noqa: E402
+from camera_source import FRAME_WAIT_TIMEOUT, ReplaySource, load_frames, recorded_fps  # noqa: E402
+from presence_detector import PresenceDetector, DetectionStats, set_camera  # noqa: E402
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "presence_scenarios.json")
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class BackendUnavailable(Exception):
+    """No face backend could be loaded - any numbers measured would be meaningless"""
+
+
+def run_scenario(scenario, base_dir, speed):
+    path = os.path.join(base_dir, scenario["path"])
+    frames = load_frames(path)
+    if not frames:
+        print(f"[{scenario['name']}] no frames in {path} - skipped")
+        return None
+
+    source = ReplaySource(frames, fps=recorded_fps(path), speed=speed)
+    set_camera(source)
+
+    wakes = []
+    approaches = []
+    detector = PresenceDetector(on_detect_callback=lambda: wakes.append(time.monotonic()))
+    detector.attach_approach(lambda: approaches.append(time.monotonic()))
+    detector.stats = DetectionStats(interval=float("inf"), keep_latencies=True)
+
+    print(f"[{scenario['name']}] {len(frames)} frames ({speed})")
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    source.start()
+    detector.start()
+    if detector.pipeline is None and detector.worker is None:
+        detector.stop()
+        source.shutdown()
+        raise BackendUnavailable(f"face backend '{presence_detector.FACE_BACKEND}' could not be loaded")
+    source.finished.wait()
+    # Let the detector finish the last frame it picked up
+    deadline = time.monotonic() + FRAME_WAIT_TIMEOUT
+    while source.frame_ring.borrowed() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    wall = time.monotonic() - wall_start
+    cpu = time.process_time() - cpu_start
+    detector.stop()
+    # The ring goes away with the shared memory on shutdown (DETECTION_PROCESS=1)
+    dropped = source.frame_ring.dropped
+    source.shutdown()
+
+    latencies = sorted(detector.stats.latencies)
+    processed = detector.stats.frames_total
+    result = {
+        "name": scenario["name"],
+        "frames": len(frames),
+        "processed": processed,
+        "dropped": dropped,
+        "fps": processed / wall if wall > 0 else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p99_ms": _percentile(latencies, 99),
+        "cpu_s": cpu,
+        "cpu_percent": cpu / wall * 100 if wall > 0 else 0.0,
+        "wakes": len(wakes),
+        "false_wakes": 0,
+        "time_to_trigger_s": None,
+        "trigger_overhead_ms": None,
+        "missed_trigger": False,
+        "approaches": len(approaches),
+        "approach_lead_s": None,
+    }
+    # Temporal filter counters (presence lost within FALSE_TRIGGER_WINDOW of a wake-up = false trigger, heuristic)
+    result.update(detector.presence.counters())
+
+    close_from = scenario.get("close_from")
+    close_time = None
+    if close_from is not None and close_from < len(source.published_at):
+        close_time = source.published_at[close_from]
+
+    if scenario.get("expect_trigger"):
+        valid = [t for t in wakes if close_time is not None and t >= close_time]
+        result["false_wakes"] = len(wakes) - len(valid)
+        if valid:
+            ttt = valid[0] - close_time
+            result["time_to_trigger_s"] = ttt
+            result["trigger_overhead_ms"] = (ttt - presence_detector.TIME_TO_TRIGGER) * 1000
+            before = [t for t in approaches if t <= valid[0]]
+            if before:
+                result["approach_lead_s"] = valid[0] - before[-1]
+        else:
+            result["missed_trigger"] = True
+    else:
+        result["false_wakes"] = len(wakes)
+    return result
+
+
+def _git_version():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def print_results(results, previous=None):
+    old = {r["name"]: r for r in previous["scenarios"]} if previous else {}
+    print(f"\n{'scenario':16} {'fps':>6} {'p50':>7} {'p99':>7} {'ttt s':>6} {'+ms':>6} {'wakes':>5} {'false':>5} {'cpu%':>5} {'lead':>5}")
+    for r in results:
+        ttt = f"{r['time_to_trigger_s']:.2f}" if r["time_to_trigger_s"] is not None else ("MISS" if r["missed_trigger"] else "-")
+        extra = f"{r['trigger_overhead_ms']:.0f}" if r["trigger_overhead_ms"] is not None else "-"
+        lead = f"{r['approach_lead_s']:.1f}" if r.get("approach_lead_s") is not None else "-"
+        print(f"{r['name']:16} {r['fps']:6.1f} {r['p50_ms']:7.2f} {r['p99_ms']:7.2f} {ttt:>6} {extra:>6} "
+              f"{r['wakes']:5} {r['false_wakes']:5} {r['cpu_percent']:5.0f} {lead:>5}")
+        before = old.get(r["name"])
+        if before:
+            print(f"{'  vs previous':16} {r['fps'] - before['fps']:+6.1f} {r['p50_ms'] - before['p50_ms']:+7.2f} "
+                  f"{r['p99_ms'] - before['p99_ms']:+7.2f} {'':>6} {'':>6} "
+                  f"{r['wakes'] - before['wakes']:+5} {r['false_wakes'] - before['false_wakes']:+5} "
+                  f"{r['cpu_percent'] - before['cpu_percent']:+5.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Presence detection scenario benchmark")
+    parser.add_argument("manifest", nargs="?", default=DEFAULT_MANIFEST, help="scenario list (JSON)")
+    parser.add_argument("--speed", choices=["realtime", "max"], default="realtime")
+    parser.add_argument("--only", help="comma separated scenario names to run")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    with open(args.manifest, "r", encoding="utf-8") as f:
+        scenarios = json.load(f)
+    if args.only:
+        wanted = set(args.only.split(","))
+        scenarios = [s for s in scenarios if s["name"] in wanted]
+    base_dir = os.path.dirname(os.path.abspath(args.manifest))
+
+    results = []
+    for scenario in scenarios:
+        try:
+            result = run_scenario(scenario, base_dir, args.speed)
+        except BackendUnavailable as e:
+            print(f"Benchmark aborted: {e}")
+            return 1
+        if result:
+            results.append(result)
+    if not results:
+        print("No scenario could be run")
+        return 1
+
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    print_results(results, previous)
+
+    if args.json:
+        report = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "version": _git_version(),
+            "speed": args.speed,
+            "config": {
+                "backend": presence_detector.FACE_BACKEND,
+                "motion_gate": presence_detector.MOTION_GATE,
+                "face_tracking": presence_detector.FACE_TRACKING,
+                "face_area_threshold": presence_detector.FACE_AREA_THRESHOLD,
+                "time_to_trigger": presence_detector.TIME_TO_TRIGGER,
+                "approach_signal": presence_detector.APPROACH_SIGNAL,
+            },
+            "scenarios": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        print(f"\nResults saved to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,77 @@
-from picamera2 import Picamera2
-import time
-
-# Initialize the camera
-picam2 = Picamera2()
-
-# Configure video recording settings
-video_config = picam2.create_video_configuration(main={"size": (1280, 720), "format": "YUV420"})
-picam2.configure(video_config)
-
-# Create an H264 encoder
-from picamera2.encoders import H264Encoder
-encoder = H264Encoder(bitrate=10000000)  # 10 Mbps bitrate
-
-# Create file output
-from picamera2.outputs import FileOutput
-output = FileOutput("my_video.h264")
-
-print("Starting recording...")
-print("Press Ctrl+C to stop")
-
-try:
-    # Start the camera
-    picam2.start()
-    time.sleep(2)  # Give camera time to adjust to lighting
-    
-    # Start recording with encoder and output
-    picam2.start_recording(encoder, output)
-    print("Recording started")
-    
-    # Record for 10 seconds
-    time.sleep(100)
-    
-    # Stop recording
-    picam2.stop_recording()
-    print("Recording saved as 'my_video.h264'")
-
-except KeyboardInterrupt:
-    # Handle Ctrl+C gracefully
-    print("\nStopping recording...")
-    picam2.stop_recording()
-    print("Recording stopped by user")
-    
-finally:
-    # Stop and close the camera
-    picam2.stop()
-    print("Camera stopped")
\ No newline at end of file
+"""
+Capture benchmark clips from the presence camera.
+
+Uses the same camera source and detector as the app (CameraSingleton,
+or CAMERA_REPLAY) instead of opening Picamera2 separately, keeps the
+last --seconds of detection frames in memory and writes a replayable
+dataset (frames.npy + annotations.json, see frame_recorder.py) only
+when presence is confirmed or when asked:
+
+    Enter           dump now
+    kill -USR1 pid  dump now
+    Ctrl+C          quit (--dump-on-exit saves the buffer first)
+
+Usage:
+    python tools/video_recorder.py [--seconds 20] [--fps 15] [--out recordings]
+                                   [--no-trigger] [--dump-on-exit]
+
+The dumped directory can be replayed with CAMERA_REPLAY=<dir> or added to
+tools/presence_scenarios.json (close_from / expect_trigger are
+pre-filled in annotations.json from the detector's view - check them).
+Don't run it next to the app on the device - the camera can only be
+opened once; set PRESENCE_RECORDER=1 for the app instead.
+"""
+
+import argparse
+import os
+import signal
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_recorder import FrameRecorder, RECORD_DIR, RECORD_FPS, RECORD_SECONDS  # noqa: E402
+from presence_detector import get_camera, get_detector, shutdown_camera  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ring-buffer capture of presence detection clips")
+    parser.add_argument("--seconds", type=float, default=RECORD_SECONDS, help="history kept in memory")
+    parser.add_argument("--fps", type=float, default=RECORD_FPS, help="frames kept per second")
+    parser.add_argument("--out", default=RECORD_DIR, help="directory for the dumped datasets")
+    parser.add_argument("--no-trigger", action="store_true", help="only dump on demand")
+    parser.add_argument("--dump-on-exit", action="store_true", help="save the buffer when quitting")
+    args = parser.parse_args()
+
+    camera = get_camera()
+    detector = get_detector()
+    # Detection runs only to annotate the frames and fire the trigger dumps
+    detector.attach(lambda: None)
+
+    recorder = FrameRecorder(camera, detector, seconds=args.seconds, fps=args.fps,
+                             out_dir=args.out, dump_on_trigger=not args.no_trigger)
+    recorder.start()
+    signal.signal(signal.SIGUSR1, lambda *_: recorder.request_dump("manual"))
+
+    print(f"Recording into memory (pid {os.getpid()}) - Enter to dump, Ctrl+C to quit")
+    interactive = True
+    try:
+        while True:
+            if interactive and sys.stdin.readline():
+                recorder.request_dump("manual")
+            else:
+                # stdin closed (running in the background) - dump on SIGUSR1 only
+                interactive = False
+                signal.pause()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        recorder.stop()
+        if args.dump_on_exit:
+            recorder.dump("exit")
+        shutdown_camera()
+        print(f"{recorder.dumps} clip(s) saved")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Pre-synthesize the chat's fixed phrases into the TTS cache - sentence by
+sentence, the pieces speak() looks up.
+
+Run once after deploying (or after changing TRANSLATIONS) while the kiosk
+has network, so the greeting plays instantly and offline afterwards:
+
+    python tools/warm_tts_cache.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat_module import spoken_phrases  # noqa: E402
+from tts_manager import TTSManager  # noqa: E402
+
+
+def main():
+    tts = TTSManager()
+    phrases = spoken_phrases()
+    started = time.perf_counter()
+    try:
+        added = tts.synthesize_missing(phrases)
+    except Exception as e:
+        print(f"Warm-up failed: {e}")
+        return 1
+    print(f"{added} new sentences for {len(phrases)} phrases synthesized in {time.perf_counter() - started:.1f} s, "
+          f"cache: {tts.cache.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
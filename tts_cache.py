@@ -0,0 +1,126 @@
+"""
+On-disk cache of synthesized speech.
+
+Audio is stored under the hash of (engine, language, normalized text), so
+the welcome line and the canned answers are downloaded once and then play
+without the network. The cache is bounded (TTS_CACHE_BYTES) and evicts
+least recently used entries; a hit refreshes the entry's mtime, which is
+what LRU order is kept in (atime is often off on the SD card). Hits,
+misses and evictions are counted (stats()).
+"""
+
+import hashlib
+import os
+import threading
+import unicodedata
+
+TTS_CACHE_DIR = os.path.join(".cache", "tts")
+TTS_CACHE_BYTES = 64 * 1024 * 1024
+AUDIO_SUFFIX = ".mp3"
+
+
+def normalize(text):
+    """What counts as 'the same text': Unicode NFC, whitespace collapsed"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TTSCache:
+    def __init__(self, directory=TTS_CACHE_DIR, max_bytes=TTS_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = {}     # path -> [size, last used]
+        self._bytes = 0
+        self._scan()
+
+    def _scan(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(AUDIO_SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                self._entries[path] = [st.st_size, st.st_mtime]
+                self._bytes += st.st_size
+
+    def path_for(self, engine, lang, text):
+        key = "\0".join((engine, lang, normalize(text)))
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + AUDIO_SUFFIX)
+
+    def contains(self, engine, lang, text):
+        return self.path_for(engine, lang, text) in self._entries
+
+    def get(self, engine, lang, text):
+        """Path of the cached audio, or None (counted as a miss)"""
+        path = self.path_for(engine, lang, text)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or not os.path.exists(path):
+                if entry is not None:
+                    self._drop(path)
+                self.misses += 1
+                return None
+            self.hits += 1
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            entry[1] = os.path.getmtime(path)
+        return path
+
+    def put(self, engine, lang, text, data):
+        """Store synthesized audio (bytes); returns its path"""
+        path = self.path_for(engine, lang, text)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            if path in self._entries:
+                self._bytes -= self._entries[path][0]
+            self._entries[path] = [len(data), os.path.getmtime(path)]
+            self._bytes += len(data)
+            self._evict(keep=path)
+        return path
+
+    def _evict(self, keep):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = min((p for p in self._entries if p != keep), key=lambda p: self._entries[p][1])
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, path):
+        size, _ = self._entries.pop(path)
+        self._bytes -= size
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self._bytes}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_tts_cache():
+    """The shared TTS cache, created on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TTSCache()
+    return _cache
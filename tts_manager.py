@@ -1,24 +1,61 @@
-import pygame
 from gtts import gTTS
+import re
 import threading
 import time
-import os
+from io import BytesIO
+
+from audio_service import TTS, get_audio_service
+from lip_sync import analyse, sound_samples
+from tts_cache import get_tts_cache
+
+TTS_ENGINE = "gtts"
+MIN_SENTENCE = 20   # fragments shorter than this ("Da.") are read together with the next one
+
+SENTENCE_END = re.compile(r'(?<=[.!?…])\s+|\n+')
+
+def split_sentences(text):
+    """Text split at sentence ends / line breaks, very short pieces merged into the next"""
+    chunks = []
+    pending = ""
+    for part in SENTENCE_END.split(text):
+        part = part.strip()
+        if not part:
+            continue
+        pending = f"{pending} {part}" if pending else part
+        if len(pending) >= MIN_SENTENCE:
+            chunks.append(pending)
+            pending = ""
+    if pending:
+        if chunks and len(pending) < MIN_SENTENCE:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
+
+def speech_chunks(text):
+    """The pieces speak() synthesizes (and caches) for text, in order"""
+    return split_sentences(text.replace('*', '').replace('#', '').strip())
 
 class TTSManager:
     def __init__(self):
-        # 1. Configurare Audio Forțată
-        try:
-            # Pre-inițializare pentru a evita lag-ul
-            pygame.mixer.pre_init(44100, -16, 2, 2048)
-            pygame.mixer.init()
-            pygame.mixer.music.set_volume(1.0) # Volum maxim
+        # Mixerul e deschis o singura data, de serviciul audio (audio_service.py)
+        self.audio = get_audio_service()
+        if self.audio.start():
             print("🔊 Mixer Audio: CONECTAT.")
-        except Exception as e:
-            print(f"❌ CRITIC: Nu pot inițializa audio: {e}")
+        else:
+            print("❌ CRITIC: Nu pot inițializa audio.")
 
-        self.stop_event = threading.Event()
+        # Fiecare speak()/stop() incepe o generatie noua - frazele celor vechi nu mai intra in coada
+        self._generation = 0
+        self._lock = threading.Lock()
         self.paused = False
         self.current_lang = 'ro'
+        # (envelope, time.monotonic() at play) of the utterance playing - for a face to lip-sync to
+        self.speech = None
+        # Frazele deja sintetizate se redau de pe disc, fara retea
+        self.cache = get_tts_cache()
+        self.last_first_audio_ms = None
+        self.last_utterance_bytes = None  # {"mp3": ..., "pcm": ...} held in memory for the last answer
 
     def set_language(self, lang_code):
         self.current_lang = lang_code
@@ -35,89 +72,139 @@ class TTSManager:
         self.paused = False
         self.unpause()
         
-        # Curățare text
-        clean_text = text.replace('*', '').replace('#', '').strip()
-        
-        # Pornim thread-ul
-        thread = threading.Thread(target=self._speak_thread, args=(clean_text,), daemon=True)
+        # Pornim thread-ul (sinteza fraza cu fraza, redarea incepe dupa prima)
+        with self._lock:
+            generation = self._generation
+        thread = threading.Thread(target=self._speak_thread, args=(text, generation, time.monotonic()),
+                                  daemon=True)
         thread.start()
 
-    def _speak_thread(self, text):
-        self.stop_event.clear()
-        
-        filename = f"tts_{int(time.time())}.mp3"
-        success = False
-
-        # --- 1. DESCĂRCARE (gTTS) ---
-        try:
-            print(f"⬇️ Descarc audio pentru: '{text[:15]}...'")
-            lang = 'ro' if self.current_lang == 'ro' else self.current_lang
-            if lang not in ['ro', 'en', 'ru']: lang = 'ro'
-            
-            tts = gTTS(text=text, lang=lang, slow=False)
-            tts.save(f"audio/{filename}")
-            success = True
-            print("✅ Audio descărcat.")
-        except Exception as e:
-            print(f"❌ EROARE NET/gTTS: {e}")
-            return # Ieșim dacă nu avem fișier
-
-        # --- 2. REDARE (Pygame) ---
-        if success and os.path.exists(filename):
+    def _tts_lang(self, lang_code):
+        lang = 'ro' if lang_code == 'ro' else lang_code
+        if lang not in ['ro', 'en', 'ru']: lang = 'ro'
+        return lang
+
+    def _synthesize(self, text, lang):
+        """(mp3 bytes of text, from the cache?) - a miss is downloaded (gTTS) into memory only"""
+        path = self.cache.get(TTS_ENGINE, lang, text)
+        if path:
             try:
-                # Verificare ultim moment
-                if self.stop_event.is_set():
-                    try: os.remove(filename); 
-                    except: pass
-                    return
+                with open(path, "rb") as f:
+                    data = f.read()
+                print(f"💾 Audio din cache pentru: '{text[:15]}...'")
+                return data, True
+            except OSError:
+                pass
+        print(f"⬇️ Descarc audio pentru: '{text[:15]}...'")
+        buf = BytesIO()
+        gTTS(text=text, lang=lang, slow=False).write_to_fp(buf)
+        print("✅ Audio descărcat.")
+        return buf.getvalue(), False
+
+    def synthesize_missing(self, phrases):
+        """
+        Download the sentences of (lang_code, text) pairs that aren't cached
+        yet - split the way speak() looks them up; returns how many were added
+        """
+        done = 0
+        for lang_code, text in phrases:
+            lang = self._tts_lang(lang_code)
+            for sentence in speech_chunks(text):
+                if self.cache.contains(TTS_ENGINE, lang, sentence):
+                    continue
+                data, _ = self._synthesize(sentence, lang)
+                self.cache.put(TTS_ENGINE, lang, sentence, data)
+                done += 1
+        return done
 
-                print("▶️ Încep redarea...")
-                pygame.mixer.music.load(filename)
-                pygame.mixer.music.play()
-                
-                # Bucla de așteptare
-                while pygame.mixer.music.get_busy() or self.paused:
-                    if self.stop_event.is_set():
-                        pygame.mixer.music.stop()
-                        break
-                    
-                    if self.paused:
-                        time.sleep(0.1)
-                        continue
-                        
-                    time.sleep(0.1)
-            
+    def warm_up(self, phrases):
+        """synthesize_missing() in the background"""
+        def _run():
+            try:
+                done = self.synthesize_missing(phrases)
             except Exception as e:
-                print(f"❌ EROARE REDARE: {e}")
-            
-            finally:
-                # --- 3. CURĂȚENIE ---
+                print(f"❌ EROARE NET/gTTS (warm-up): {e}")
+                return
+            if done:
+                print(f"TTS cache warm-up: {done} sentences, {self.cache.stats()}")
+
+        threading.Thread(target=_run, daemon=True).start()
+
+    def _speak_thread(self, text, generation, requested):
+        """
+        Pipeline: sentence N+1 is synthesized while sentence N plays - the
+        audio service's TTS queue keeps them in order. Nothing is written to
+        disk before a sentence plays: it is decoded from the downloaded bytes,
+        and only then stored in the cache.
+        """
+        lang = self._tts_lang(self.current_lang)
+        sentences = speech_chunks(text)
+        first = True
+        held = {"mp3": 0, "pcm": 0}
+
+        for sentence in sentences:
+            if generation != self._generation:
+                return
+
+            # --- 1. SINTEZA (cache sau gTTS, in memorie) ---
+            try:
+                data, cached = self._synthesize(sentence, lang)
+                sound = self.audio.load(BytesIO(data))
+                envelope = analyse(*sound_samples(sound))
+            except Exception as e:
+                print(f"❌ EROARE NET/gTTS: {e}")
+                return # Fara fraza asta, restul n-ar mai avea sens
+            held["mp3"] += len(data)
+            held["pcm"] += self.audio.sound_bytes(sound)
+
+            # --- 2. REDARE (serviciul audio, coada TTS) ---
+            def _on_start(envelope=envelope, first=first):
+                self.speech = (envelope, time.monotonic()) if envelope else None
+                if first:
+                    self.last_first_audio_ms = (time.monotonic() - requested) * 1000
+                    print(f"⏱️ Primul sunet după {self.last_first_audio_ms:.0f} ms ({len(sentences)} fraze)")
+
+            def _on_end(finished, envelope=envelope):
+                if self.speech and self.speech[0] is envelope:
+                    self.speech = None
+
+            with self._lock:
+                # stop() nu poate trece intre verificare si intrarea in coada
+                if generation != self._generation:
+                    return
+                if not self.audio.enqueue(TTS, sound, on_end=_on_end, on_start=_on_start):
+                    print("❌ EROARE REDARE: canal ocupat")
+                    return
+                # Si cand pauza a venit intre fraze, cu canalul liber - fraza asta porneste direct
+                if self.paused:
+                    self.audio.pause(TTS)
+            first = False
+
+            # --- 3. CACHE (dupa ce fraza e deja in coada) ---
+            if not cached:
                 try:
-                    pygame.mixer.music.unload()
-                    time.sleep(0.1) # Dăm timp sistemului să elibereze fișierul
-                    if os.path.exists(filename):
-                        os.remove(filename)
-                        print("🗑️ Cache șters.")
-                except:
-                    pass
+                    self.cache.put(TTS_ENGINE, lang, sentence, data)
+                except OSError as e:
+                    print(f"TTS cache write failed: {e}")
+
+        self.last_utterance_bytes = held
+        print(f"🧠 Audio in memorie: {held['mp3'] / 1024:.0f} KB mp3 + {held['pcm'] / 1024:.0f} KB PCM "
+              f"({len(sentences)} fraze)")
 
     def pause(self):
         self.paused = True
-        if pygame.mixer.music.get_busy(): 
-            pygame.mixer.music.pause()
+        if self.audio.is_busy(TTS):
+            self.audio.pause(TTS)
             print("II Pauză.")
 
     def unpause(self):
         self.paused = False
-        try: 
-            pygame.mixer.music.unpause()
-            print("▶ Reluare.")
-        except: pass
+        self.audio.resume(TTS)
+        print("▶ Reluare.")
 
     def stop(self):
-        self.stop_event.set()
-        self.paused = False
-        try:
-            pygame.mixer.music.stop()
-            pygame.mixer.music.unload()
-        except: pass
\ No newline at end of file
+        # Anuleaza si frazele inca in sinteza, nu doar coada
+        with self._lock:
+            self._generation += 1
+            self.paused = False
+            self.audio.stop(TTS)
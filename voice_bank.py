@@ -0,0 +1,95 @@
+"""
+The mascot's voice lines, decoded once and played from memory.
+
+Every .wav under VOICE_DIR is decoded into a Sound (and its
+lip-sync envelope, see lip_sync.py) in a background thread when the app
+starts. play() starts a line on the audio service's voice lane (a
+reserved mixer channel) - no thread, no file I/O, so a line starts
+within one mixer buffer of the call.
+"""
+
+import os
+import random
+import threading
+import time
+
+from audio_service import VOICE, get_audio_service
+from lip_sync import EnvelopeBank
+
+VOICE_DIR = "voicelines"
+CATEGORIES = ("wakeup", "normal", "chemare", "letsgo")
+
+
+class VoiceBank:
+    def __init__(self, directory=VOICE_DIR, categories=CATEGORIES):
+        self.lines = {}     # category -> [path]
+        for category in categories:
+            folder = os.path.join(directory, category)
+            if os.path.exists(folder):
+                self.lines[category] = sorted(os.path.join(folder, f) for f in os.listdir(folder)
+                                              if f.endswith(".wav"))
+        self.envelopes = EnvelopeBank()
+        self.audio = get_audio_service()
+        self._sounds = {}   # path -> Sound
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Open the audio service and decode every line in the background"""
+        if not self.audio.start():
+            return
+
+        def _run():
+            started = time.perf_counter()
+            for path in (p for paths in self.lines.values() for p in paths):
+                self._sound(path)
+                self.envelopes.get(path)
+            print(f"Voice bank: {len(self._sounds)} lines in memory "
+                  f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+        threading.Thread(target=_run, daemon=True).start()
+
+    def _sound(self, path):
+        with self._lock:
+            sound = self._sounds.get(path)
+            if sound is None:
+                try:
+                    sound = self.audio.load(path)
+                except Exception as e:
+                    print(f"Error loading sound {path}: {e}")
+                    return None
+                self._sounds[path] = sound
+            return sound
+
+    def play(self, category):
+        """
+        Start a random line of the category unless the voice is already
+        speaking (or TTS is); returns (path, envelope or None), or None if
+        nothing played
+        """
+        if not self.lines.get(category) or self.audio.is_busy(VOICE):
+            return None
+        path = random.choice(self.lines[category])
+        sound = self._sound(path)
+        if sound is None or not self.audio.play(VOICE, sound):
+            return None
+        print(f"Playing audio: {path}")
+        return path, self.envelopes.get(path)
+
+    def is_speaking(self):
+        return self.audio.is_busy(VOICE)
+
+    def stop(self):
+        self.audio.stop(VOICE)
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+def get_voice_bank():
+    """The shared voice bank, created on first use"""
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = VoiceBank()
+    return _bank